@@ -26,6 +26,86 @@ DEFAULT_LIMIT_TOWNS = 100
 # Maximum offset for pagination (prevents excessive memory usage)
 MAX_OFFSET = 100000
 
+# Batch lookups by id
+MAX_BATCH_IDS = 50000
+BATCH_STREAM_THRESHOLD = 1000  # Larger batch responses are streamed in chunks
+
+# List responses with more rows than this are streamed in chunks
+LIST_STREAM_THRESHOLD = 1000
+
+# Maximum number of sub-queries in one compound query (POST /api/v1/query)
+MAX_COMPOUND_QUERIES = 20
+
+
+# ============================================================================
+# SORTING
+# ============================================================================
+
+# Number of multi-field sort orders kept in memory (single-field orders are always kept)
+COMPOSITE_SORT_CACHE_SIZE = 16
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+# Streamed exports are flushed to the client in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Rows per row group in Parquet exports
+EXPORT_PARQUET_ROW_GROUP_SIZE = 10000
+
+# Rows per record batch in Arrow IPC streams
+EXPORT_ARROW_BATCH_SIZE = 10000
+
+
+# ============================================================================
+# PRE-COMPRESSED RESPONSES
+# ============================================================================
+
+# Full-dataset requests whose JSON responses are built and compressed once per worker at startup
+PRECOMPRESSED_REQUESTS = (
+    "/api/v1/provinces",
+    "/api/v1/districts",
+    "/api/v1/districts?limit=1000",
+    "/api/v1/neighborhoods",
+    "/api/v1/neighborhoods?limit=50000",
+    "/api/v1/villages",
+    "/api/v1/villages?limit=50000",
+    "/api/v1/towns",
+)
+
+
+# ============================================================================
+# RESPONSE COMPRESSION
+# ============================================================================
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = 1000
+
+# Level of each coding for responses compressed per request
+# (br 5 and zstd 9 produce smaller bodies than gzip 9 in about a fifth of the time)
+COMPRESSION_LEVELS = {"br": 5, "zstd": 9, "gzip": 6}
+
+# Levels by path prefix, the longest matching prefix winning
+# Bulk exports are mostly too large to cache (see COMPRESSION_CACHE_ENTRY_BYTES), so they favor speed
+COMPRESSION_ROUTE_LEVELS = {
+    "/api/v1/export/": {"br": 1, "zstd": 3, "gzip": 1},
+    "/api/v1/arrow/": {"br": 1, "zstd": 3, "gzip": 1},
+}
+
+# Media types whose bodies are compressed already (or must not be buffered) and are sent as they are
+COMPRESSION_EXCLUDED_MEDIA_TYPES = ("application/vnd.apache.parquet", "text/event-stream")
+
+# Total size of the compressed bodies kept for repeated responses (least recently used are dropped first)
+COMPRESSION_CACHE_BYTES = 64 * 1024 * 1024
+
+# Largest compressed body kept, so a single bulk export cannot push every other body out
+COMPRESSION_CACHE_ENTRY_BYTES = 8 * 1024 * 1024
+
+# Responses cached by request: under these prefixes a body depends only on the path, query, format and language
+COMPRESSION_CACHE_PATH_PREFIXES = ("/api/",)
+
 
 # ============================================================================
 # DATA VALIDATION BOUNDS
@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import logging
 import time
@@ -7,8 +8,7 @@ from typing import Any, Dict
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.i18n import (
     DEFAULT_LANGUAGE,
@@ -19,13 +19,17 @@ from app.i18n import (
     get_translations,
 )
 from app.logging_config import setup_logging
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.content_negotiation import ContentNegotiationMiddleware
 from app.middleware.language import LanguageMiddleware
 from app.middleware.metrics import MetricsMiddleware
+from app.middleware.precompressed import PrecompressedMiddleware
 from app.middleware.rate_limit import setup_rate_limiting
 from app.middleware.security import SecurityHeadersMiddleware
 from app.monitoring import set_app_info, setup_prometheus_metrics, update_data_loader_metrics
-from app.routers import districts, neighborhoods, provinces, towns, villages
+from app.routers import districts, export, neighborhoods, provinces, query, towns, villages
 from app.scalar_docs import setup_scalar_docs
+from app.services.artifact_service import artifact_service
 from app.services.data_loader import data_loader
 from app.settings import settings
 from app.versioning import get_version_info
@@ -35,6 +39,12 @@ setup_logging(level=settings.effective_log_level, environment=settings.environme
 logger = logging.getLogger(__name__)
 
 
+def _log_artifact_build_failure(task: asyncio.Task) -> None:
+    """Log an error that ended the background build of the pre-compressed responses."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Failed to build pre-compressed responses", exc_info=task.exception())
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup/shutdown events."""
@@ -48,6 +58,19 @@ async def lifespan(app: FastAPI):
         district_count = len(data_loader.districts)
         logger.info(f"Data loaded successfully: {province_count} provinces, {district_count} districts")
 
+        # Serialize province and district detail documents ahead of the first request
+        document_count = data_loader.materialize_detail_documents()
+        logger.info(f"Materialized {document_count} detail documents")
+
+        # Encode every list record once; list responses join these fragments
+        fragment_count = data_loader.materialize_fragments()
+        logger.info(f"Materialized {fragment_count} list fragments")
+
+        # Render the full-dataset responses and compress them in the background (see PrecompressedMiddleware)
+        if settings.precompressed_enabled:
+            app.state.artifact_build = asyncio.create_task(artifact_service.build(app))
+            app.state.artifact_build.add_done_callback(_log_artifact_build_failure)
+
         # Update Prometheus metrics with data loader stats
         if settings.prometheus_enabled:
             update_data_loader_metrics(data_loader)
@@ -60,6 +83,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Application shutting down...")
+    artifact_build = getattr(app.state, "artifact_build", None)
+    if artifact_build is not None and not artifact_build.done():
+        artifact_build.cancel()
 
 
 app = FastAPI(
@@ -71,6 +97,7 @@ app = FastAPI(
     version=settings.app_version,
     docs_url=None,
     redoc_url=None,
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Adem Kurtipek",
         "email": "gncharitaci@gmail.com",
@@ -82,8 +109,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Serve pre-compressed full-dataset responses (built at startup by artifact_service)
+# Added first so it is the innermost middleware and every other one still processes its responses
+app.add_middleware(PrecompressedMiddleware)
+
 # Add Security Headers middleware (OWASP compliance)
-# Must be added first to ensure security headers on all responses
+# Added before the remaining middleware to ensure security headers on all responses
 app.add_middleware(SecurityHeadersMiddleware, expose_server_header=settings.expose_server_header)
 
 # Add CORS middleware with environment-aware configuration
@@ -107,12 +138,15 @@ app.add_middleware(
     cookie_samesite=settings.cookie_samesite,  # Strict in production for CSRF protection
 )
 
+# Add response format negotiation (JSON, MessagePack or CBOR from the Accept header)
+app.add_middleware(ContentNegotiationMiddleware)
+
 # Add metrics middleware for request tracking
 app.add_middleware(MetricsMiddleware)
 
-# Add GZip compression middleware for bandwidth optimization (60-70% reduction for JSON)
+# Add Brotli, Zstandard or gzip compression for bandwidth optimization (85-90% reduction for JSON lists)
 # Must be added after other middleware to compress the final response
-app.add_middleware(GZipMiddleware, minimum_size=1000)  # Only compress responses > 1KB
+app.add_middleware(CompressionMiddleware, minimum_size=1000)  # Only compress responses > 1KB
 
 # Setup rate limiting with Redis support (if enabled in settings)
 setup_rate_limiting(
@@ -273,6 +307,8 @@ app.include_router(districts.router, prefix="/api/v1", tags=["Districts"])
 app.include_router(neighborhoods.router, prefix="/api/v1", tags=["Neighborhoods"])
 app.include_router(villages.router, prefix="/api/v1", tags=["Villages"])
 app.include_router(towns.router, prefix="/api/v1", tags=["Towns"])
+app.include_router(query.router, prefix="/api/v1", tags=["Query"])
+app.include_router(export.router, prefix="/api/v1", tags=["Export"])
 
 setup_scalar_docs(app)
 
@@ -420,6 +456,14 @@ def get_openapi_for_language(language: str) -> Dict[str, Any]:
             "The limit of the neighborhoods list": translations["parameter_descriptions"]["limit_list"],
             "The limit of the villages list": translations["parameter_descriptions"]["limit_list"],
             "The limit of the towns list": translations["parameter_descriptions"]["limit_list"],
+            "The cursor of the next page (nextCursor of the previous response)": translations["parameter_descriptions"][
+                "cursor"
+            ],
+            "Include pagination metadata (total, offset, limit, hasMore)": translations["parameter_descriptions"][
+                "meta"
+            ],
+            "Return only the number of matching records": translations["parameter_descriptions"]["count_only"],
+            "The IDs to look up (comma separated)": translations["parameter_descriptions"]["ids"],
             # Response formatting parameters
             "The fields to be returned (comma separated)": translations["parameter_descriptions"]["fields_return"],
             "The sorting of the provinces list (put '-' before the field name for descending order)": translations[
@@ -0,0 +1,243 @@
+"""
+Response compression middleware.
+
+Compresses responses in the best content coding the client accepts (Brotli,
+Zstandard or gzip), at levels tuned per route. Compressed bodies of
+repeated responses, streamed ones included, are kept in a bounded LRU cache,
+so a query asked again is not compressed again.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Hashable, Mapping, Optional, Sequence
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config import (
+    COMPRESSION_CACHE_BYTES,
+    COMPRESSION_CACHE_ENTRY_BYTES,
+    COMPRESSION_CACHE_PATH_PREFIXES,
+    COMPRESSION_EXCLUDED_MEDIA_TYPES,
+    COMPRESSION_LEVELS,
+    COMPRESSION_MINIMUM_SIZE,
+    COMPRESSION_ROUTE_LEVELS,
+)
+from app.services.compression import IDENTITY, StreamCompressor, available_codings, compress, negotiate_coding
+from app.services.encoding import negotiate
+
+logger = logging.getLogger(__name__)
+
+# Responses without a body to compress
+NO_BODY_STATUS_CODES = (204, 304)
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware compressing responses with the negotiated content coding.
+
+    Responses of known length are compressed whole; streamed responses are
+    compressed chunk by chunk as they are sent. Compression runs in a worker
+    thread, so large bodies do not hold up other requests. Successful GET
+    responses under the cached path prefixes are cached by request (path,
+    query, format and language) with their coding and level, and answered
+    from the cache when asked again. Responses that already have a
+    Content-Encoding, such as the pre-compressed full-dataset responses, and
+    compressed media types are sent as they are.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        levels: Mapping[str, int] = COMPRESSION_LEVELS,
+        route_levels: Mapping[str, Mapping[str, int]] = COMPRESSION_ROUTE_LEVELS,
+        excluded_media_types: Sequence[str] = COMPRESSION_EXCLUDED_MEDIA_TYPES,
+        cache_bytes: int = COMPRESSION_CACHE_BYTES,
+        cache_entry_bytes: int = COMPRESSION_CACHE_ENTRY_BYTES,
+        cache_path_prefixes: Sequence[str] = COMPRESSION_CACHE_PATH_PREFIXES,
+    ):
+        """
+        Initialize compression middleware.
+
+        Args:
+            app: FastAPI application instance
+            minimum_size: Responses smaller than this are sent uncompressed
+            levels: Compression level of each coding
+            route_levels: Levels overriding the defaults by path prefix (longest prefix wins)
+            excluded_media_types: Media types sent uncompressed
+            cache_bytes: Total size of the cached compressed bodies (0 disables the cache)
+            cache_entry_bytes: Largest compressed body cached
+            cache_path_prefixes: Path prefixes of the responses cached by request
+        """
+        super().__init__(app)
+        self.minimum_size = minimum_size
+        self.levels = dict(levels)
+        self.route_levels = sorted(route_levels.items(), key=lambda item: len(item[0]), reverse=True)
+        self.excluded_media_types = tuple(excluded_media_types)
+        self.cache = CompressedBodyCache(cache_bytes, max_entry_bytes=cache_entry_bytes)
+        self.cache_path_prefixes = tuple(cache_path_prefixes)
+        logger.info(f"CompressionMiddleware initialized (codings: {', '.join(available_codings())})")
+
+    async def dispatch(self, request: Request, call_next):
+        """
+        Process request and compress its response.
+
+        Args:
+            request: Incoming HTTP request
+            call_next: Next middleware or route handler
+
+        Returns:
+            Response, compressed if the client accepts a supported coding
+        """
+        response = await call_next(request)
+        if (
+            response.status_code in NO_BODY_STATUS_CODES
+            or "content-encoding" in response.headers
+            or response.headers.get("content-type", "").startswith(self.excluded_media_types)
+        ):
+            return response
+
+        coding = negotiate_coding(request.headers.get("accept-encoding"), available_codings())
+        if coding in (None, IDENTITY):
+            return response
+
+        level = self._level(request.url.path, coding)
+        key = self._cache_key(request, response.status_code, coding, level)
+        compressed = self.cache.get(key) if key is not None else None
+        if compressed is not None:
+            # The route's own body is not needed
+            await response.body_iterator.aclose()
+            response.body_iterator = _single(compressed)
+            response.headers["Content-Length"] = str(len(compressed))
+        elif "content-length" not in response.headers:
+            store = (lambda body: self.cache.put(key, body)) if key is not None else None
+            response.body_iterator = _compressed_stream(
+                response.body_iterator, StreamCompressor(coding, level), store, self.cache.max_entry_bytes
+            )
+        else:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            if len(body) < self.minimum_size:
+                response.body_iterator = _single(body)
+                return response
+
+            compressed = await asyncio.get_running_loop().run_in_executor(None, compress, body, coding, level)
+            if key is not None:
+                self.cache.put(key, compressed)
+            response.body_iterator = _single(compressed)
+            response.headers["Content-Length"] = str(len(compressed))
+
+        response.headers["Content-Encoding"] = coding
+        _add_vary(response.headers, "Accept-Encoding")
+        return response
+
+    def _level(self, path: str, coding: str) -> int:
+        for prefix, levels in self.route_levels:
+            if path.startswith(prefix) and coding in levels:
+                return levels[coding]
+        return self.levels[coding]
+
+    def _cache_key(self, request: Request, status_code: int, coding: str, level: int) -> Optional[tuple]:
+        path = request.url.path
+        if request.method != "GET" or status_code != 200 or not path.startswith(self.cache_path_prefixes):
+            return None
+        # Parameter order does not matter, except between values of the same parameter
+        query = tuple(sorted(request.query_params.multi_items(), key=lambda item: item[0]))
+        # The language is detected by LanguageMiddleware, further in
+        language = getattr(request.state, "language", None)
+        return path, query, negotiate(request.headers.get("accept")), language, coding, level
+
+
+class CompressedBodyCache:
+    """LRU cache of compressed response bodies bounded by their total size."""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: Optional[int] = None):
+        """
+        Create an empty cache.
+
+        Args:
+            max_bytes: Total size of the bodies kept
+            max_entry_bytes: Size of the largest body kept (max_bytes by default)
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes if max_entry_bytes is None else min(max_entry_bytes, max_bytes)
+        self.size = 0
+        self._bodies: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Look up a compressed body, marking it as recently used.
+
+        Args:
+            key: Request key with the coding and level
+
+        Returns:
+            Compressed body, or None if it is not cached
+        """
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+        return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        """
+        Store a compressed body, dropping the least recently used ones beyond the size limit.
+
+        Args:
+            key: Request key with the coding and level
+            body: Compressed body
+        """
+        if len(body) > self.max_entry_bytes:
+            return
+        previous = self._bodies.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._bodies[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, dropped = self._bodies.popitem(last=False)
+            self.size -= len(dropped)
+
+
+async def _single(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+async def _compressed_stream(
+    chunks: AsyncIterator[bytes],
+    compressor: StreamCompressor,
+    store: Optional[Callable[[bytes], None]] = None,
+    max_stored_bytes: int = 0,
+) -> AsyncIterator[bytes]:
+    # The compressed chunks are collected for store() until they outgrow max_stored_bytes
+    loop = asyncio.get_running_loop()
+    parts = [] if store is not None else None
+    size = 0
+    async for chunk in chunks:
+        data = await loop.run_in_executor(None, compressor.compress, chunk)
+        if data:
+            if parts is not None:
+                size += len(data)
+                if size > max_stored_bytes:
+                    parts = None
+                else:
+                    parts.append(data)
+            yield data
+    data = compressor.finish()
+    yield data
+    if parts is not None and size + len(data) <= max_stored_bytes:
+        parts.append(data)
+        store(b"".join(parts))
+
+
+def _add_vary(headers: MutableHeaders, field: str) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = field
+    elif field.lower() not in (value.strip().lower() for value in vary.split(",")):
+        headers["Vary"] = f"{vary}, {field}"
@@ -0,0 +1,36 @@
+"""
+Response format negotiation middleware.
+
+Reads the Accept header once per request and stores the chosen format
+(JSON, MessagePack or CBOR) for app.responses to encode the response with.
+"""
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.responses import set_response_format
+from app.services.encoding import negotiate
+
+
+class ContentNegotiationMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware selecting the response format from the Accept header.
+
+    JSON is used when the header is missing or names no supported media type.
+    Requests accepting only formats whose encoder is not installed are
+    answered with 406 by the endpoints that encode through app.responses.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        """
+        Process request and negotiate its response format.
+
+        Args:
+            request: Incoming HTTP request
+            call_next: Next middleware or route handler
+
+        Returns:
+            Response of the route handler
+        """
+        set_response_format(negotiate(request.headers.get("accept")))
+        return await call_next(request)
@@ -0,0 +1,69 @@
+"""
+Pre-compressed response middleware.
+
+Answers full-dataset requests from the bodies built by ArtifactService, in
+the content coding negotiated from Accept-Encoding, without rendering or
+compressing anything per request.
+"""
+
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.services.artifact_service import artifact_service
+from app.services.compression import IDENTITY, available_codings, negotiate_coding
+from app.services.encoding import negotiate
+
+# Pre-built responses depend on both negotiation headers
+VARY = "Accept, Accept-Encoding"
+
+
+class PrecompressedMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware serving pre-built responses of full-dataset requests.
+
+    Only GET requests for JSON whose path and query match a pre-built
+    response are answered here, with its ETag (If-None-Match is answered with
+    304). Everything else, including requests for a coding whose body is not
+    compressed yet, goes through the routes as usual.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        """
+        Process request and serve its pre-built response if there is one.
+
+        Args:
+            request: Incoming HTTP request
+            call_next: Next middleware or route handler
+
+        Returns:
+            Pre-built response, or the response of the route handler
+        """
+        if request.method != "GET":
+            return await call_next(request)
+        artifact = artifact_service.get(request.url.path, request.url.query)
+        if artifact is None or negotiate(request.headers.get("accept")) != "json":
+            return await call_next(request)
+
+        coding = negotiate_coding(request.headers.get("accept-encoding"), available_codings())
+        body = artifact.bodies.get(coding)
+        if body is None:
+            return await call_next(request)
+
+        etag = artifact.etag(coding)
+        headers = {"ETag": etag, "Vary": VARY}
+        if _matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        if coding != IDENTITY:
+            headers["Content-Encoding"] = coding
+        return Response(content=body, media_type=artifact.media_type, headers=headers)
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
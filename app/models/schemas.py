@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -117,6 +117,20 @@ class Town(BaseModel):
     population: int
 
 
+class BatchRequest(BaseModel):
+    ids: List[int]
+
+
+class SubQuery(BaseModel):
+    resource: Literal["provinces", "districts", "neighborhoods", "villages", "towns"]
+    id: Optional[int] = None
+    params: Dict[str, Any] = {}
+
+
+class CompoundQuery(BaseModel):
+    queries: Dict[str, SubQuery]
+
+
 class APIResponse(BaseModel):
     status: str
     data: Optional[List | dict] = None
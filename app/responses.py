@@ -0,0 +1,302 @@
+"""
+Response envelope helpers shared by the API routers.
+
+Routers return ``{"status": "OK", "data": ...}`` envelopes; this module builds
+the list variants that carry pagination metadata and wraps pre-serialized
+documents without decoding them. Responses are JSON unless the request's
+Accept header asked for MessagePack or CBOR (see ContentNegotiationMiddleware).
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+
+from app.config import BATCH_STREAM_THRESHOLD, LIST_STREAM_THRESHOLD
+from app.services.base_service import Page
+from app.services.data_loader import PARENT_NAME_FIELDS
+from app.services.encoding import MEDIA_TYPES, document_envelope, encode, envelope_parts, is_available
+from app.services.projection import FieldProjection, compile_fields
+
+# Number of records serialized per streamed chunk
+STREAM_CHUNK_SIZE = 500
+
+# Layouts of the "data" of list responses: records, one array per field, or a header with value arrays
+LIST_FORMATS = ("objects", "columns", "rows")
+
+# Responses depend on the Accept header, so shared caches must key on it
+VARY_ACCEPT = {"Vary": "Accept"}
+
+# Response format negotiated for the current request (None if nothing acceptable can be produced)
+_response_format: ContextVar[Optional[str]] = ContextVar("response_format", default="json")
+
+
+def set_response_format(format: Optional[str]) -> None:
+    """
+    Set the response format of the current request.
+
+    Args:
+        format: Format name from encoding.negotiate
+    """
+    _response_format.set(format)
+
+
+def negotiated_format() -> str:
+    """
+    Get the response format of the current request.
+
+    Returns:
+        Format name, one of encoding.MEDIA_TYPES
+
+    Raises:
+        HTTPException: If the request only accepts formats that cannot be produced
+    """
+    format = _response_format.get()
+    if format is None:
+        available = ", ".join(media_type for name, media_type in MEDIA_TYPES.items() if is_available(name))
+        raise HTTPException(status_code=406, detail=f"Not Acceptable. Available media types: {available}")
+    return format
+
+
+def envelope_response(content: Any) -> Response:
+    """
+    Render a response envelope in the negotiated format.
+
+    Routes return this instead of a plain dictionary: FastAPI runs
+    ``jsonable_encoder`` over every returned value that is not a Response,
+    walking each record although the data is already JSON-native.
+
+    Args:
+        content: JSON-native response envelope
+
+    Returns:
+        JSON (orjson), MessagePack or CBOR response
+
+    Raises:
+        HTTPException: If the request only accepts formats that cannot be produced
+    """
+    format = negotiated_format()
+    if format == "json":
+        return ORJSONResponse(content, headers=VARY_ACCEPT)
+    return Response(content=encode(content, format), media_type=MEDIA_TYPES[format], headers=VARY_ACCEPT)
+
+
+def page_fields(fields: Optional[str], format: str = "objects", normalize: bool = False) -> Optional[str]:
+    """
+    Get the fields a list endpoint should ask its service to project.
+
+    Columnar formats and normalized responses read the selected fields
+    straight from the whole records while building their data, so the
+    service returns those.
+
+    Args:
+        fields: Comma-separated list of fields to return
+        format: List response format, one of LIST_FORMATS
+        normalize: Whether ancestor names are moved to a side table
+
+    Returns:
+        Fields to pass to the service
+    """
+    return fields if format == "objects" and not normalize else None
+
+
+def list_envelope(
+    page: Page,
+    offset: int,
+    limit: int,
+    meta: bool = False,
+    count_only: bool = False,
+    names: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the response envelope for a list endpoint.
+
+    Args:
+        page: Page returned by the service
+        offset: Requested offset
+        limit: Requested limit
+        meta: Whether to include pagination metadata
+        count_only: Whether to return only the number of matching records
+        names: Ancestor name side table of normalized responses
+
+    Returns:
+        Response envelope dictionary
+    """
+    if count_only:
+        return {"status": "OK", "data": {"total": page.total}}
+
+    envelope = {"status": "OK", "data": page}
+    if names is not None:
+        envelope["names"] = names
+    envelope["nextCursor"] = page.next_cursor
+    if meta:
+        envelope["meta"] = {
+            "total": page.total,
+            "offset": offset,
+            "limit": limit,
+            "hasMore": page.next_cursor is not None,
+        }
+    return envelope
+
+
+def list_response(
+    page: Page,
+    offset: int,
+    limit: int,
+    meta: bool = False,
+    count_only: bool = False,
+    format: str = "objects",
+    fields: Optional[str] = None,
+    normalize: bool = False,
+) -> Response:
+    """
+    Render the response of a list endpoint.
+
+    Pages of whole records are assembled by joining their pre-encoded
+    fragments into the envelope; only the envelope fields are encoded. Pages
+    of more than LIST_STREAM_THRESHOLD rows are streamed in chunks, so the
+    body is never held in memory at once and the first bytes go out sooner.
+
+    With format "columns" the data holds one array of values per field; with
+    "rows" a list of field names and one array of values per record. Both are
+    gathered from the entity's stored columns where possible, so whole records
+    are never projected into per-row dictionaries (see page_fields).
+
+    Normalized responses leave the names of the records' ancestors (such as
+    "province" and "district") out of the data, keeping their ids (selecting
+    a name field selects its id field), and add a "names" side table mapping
+    each ancestor id to its name once.
+
+    Args:
+        page: Page returned by the service
+        offset: Requested offset
+        limit: Requested limit
+        meta: Whether to include pagination metadata
+        count_only: Whether to return only the number of matching records
+        format: Layout of the data, one of LIST_FORMATS
+        fields: Comma-separated list of fields to return (projected here unless
+            the service already did, see page_fields)
+        normalize: Whether to move ancestor names to the "names" side table
+
+    Returns:
+        Response in the negotiated format, streamed for large pages
+
+    Raises:
+        HTTPException: If the format is unknown or the request only accepts
+            media types that cannot be produced
+    """
+    if format not in LIST_FORMATS:
+        raise HTTPException(
+            status_code=400, detail=f"Unsupported list format '{format}'. Use one of: {', '.join(LIST_FORMATS)}"
+        )
+
+    names = page.parent_names() if normalize else None
+    envelope = list_envelope(page, offset, limit, meta=meta, count_only=count_only, names=names)
+    if count_only:
+        return envelope_response(envelope)
+
+    replaced = PARENT_NAME_FIELDS.get(page.source[0]) if normalize and page.source else None
+    if format != "objects":
+        envelope["data"] = _columnar(page, fields, rows=format == "rows", replaced=replaced)
+        return envelope_response(envelope)
+
+    records = page
+    if normalize and fields:
+        records = envelope["data"] = _projection(fields, replaced).page(page)
+
+    encoding = negotiated_format()
+    fragments = page.fragments(encoding, normalized=normalize) if records is page else None
+    streamed = len(records) > LIST_STREAM_THRESHOLD
+    if fragments is None and not streamed:
+        return envelope_response(envelope)
+
+    parts = envelope_parts(envelope, _batches(records, fragments, encoding), len(records), encoding)
+    if streamed:
+        return StreamingResponse(parts, media_type=MEDIA_TYPES[encoding], headers=VARY_ACCEPT)
+    return Response(content=b"".join(parts), media_type=MEDIA_TYPES[encoding], headers=VARY_ACCEPT)
+
+
+def document_response(document: bytes, format: str = "json") -> Response:
+    """
+    Wrap a pre-serialized document in the response envelope.
+
+    Args:
+        document: Document encoded in the given format
+        format: Format name, one of encoding.MEDIA_TYPES
+
+    Returns:
+        Response with the document as "data"
+    """
+    return Response(content=document_envelope(document, format), media_type=MEDIA_TYPES[format], headers=VARY_ACCEPT)
+
+
+def batch_response(records: List[Dict[str, Any]], missing: List[int]) -> Response:
+    """
+    Build the response of a batch lookup.
+
+    Small results are returned as a regular envelope; larger ones are streamed
+    in chunks so the whole body is never held in memory at once.
+
+    Args:
+        records: Records found, in input order
+        missing: Requested ids that do not exist
+
+    Returns:
+        Response in the negotiated format, streamed for large results
+
+    Raises:
+        HTTPException: If the request only accepts formats that cannot be produced
+    """
+    envelope = {"status": "OK", "data": records, "missing": missing}
+    if len(records) <= BATCH_STREAM_THRESHOLD:
+        return envelope_response(envelope)
+
+    format = negotiated_format()
+    parts = envelope_parts(envelope, _batches(records, None, format), len(records), format)
+    return StreamingResponse(parts, media_type=MEDIA_TYPES[format], headers=VARY_ACCEPT)
+
+
+def _columnar(
+    page: Page, fields: Optional[str], rows: bool, replaced: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    # Fields follow the first record, like CSV exports; records lacking a field get null
+    projection = _projection(fields, replaced) if fields else None
+    keys = list(projection(page[0]) if projection else page[0]) if page else []
+    if replaced and not projection:
+        keys = [key for key in keys if key not in replaced]
+
+    columns = []
+    for key in keys:
+        column = page.column(key) if projection is None or projection.fields[key] is None else None
+        if column is None:
+            column = list(projection.column(page, key)) if projection else [record.get(key) for record in page]
+        columns.append(column)
+
+    if rows:
+        return {"columns": keys, "rows": list(zip(*columns))}
+    return dict(zip(keys, columns))
+
+
+def _projection(fields: str, replaced: Optional[Dict[str, str]] = None) -> FieldProjection:
+    # Selected name fields of normalized responses are replaced by the matching id fields
+    projection = compile_fields(fields)
+    if not replaced or not replaced.keys() & projection.fields.keys():
+        return projection
+
+    selected = {}
+    for key, nested in projection.fields.items():
+        if key in replaced:
+            selected.setdefault(replaced[key], None)
+        else:
+            selected[key] = nested
+    return FieldProjection(selected)
+
+
+def _batches(records: List[Dict[str, Any]], fragments: Optional[List[bytes]], format: str) -> Iterator[List[bytes]]:
+    # Encoded records, STREAM_CHUNK_SIZE at a time (pre-encoded fragments when available)
+    for start in range(0, len(records), STREAM_CHUNK_SIZE):
+        if fragments is None:
+            yield [encode(record, format) for record in records[start : start + STREAM_CHUNK_SIZE]]
+        else:
+            yield fragments[start : start + STREAM_CHUNK_SIZE]
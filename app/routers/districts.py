@@ -3,6 +3,15 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Path, Query
 
+from app.models.schemas import BatchRequest
+from app.responses import (
+    batch_response,
+    document_response,
+    envelope_response,
+    list_response,
+    negotiated_format,
+    page_fields,
+)
 from app.services.district_service import district_service
 
 logger = logging.getLogger(__name__)
@@ -26,6 +35,13 @@ async def get_districts(
     sort: Optional[str] = Query(
         None, description="The sorting of the districts list (put '-' before the field name for descending order)"
     ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
 ):
     try:
         districts = district_service.get_districts(
@@ -40,10 +56,15 @@ async def get_districts(
             postal_code=postalCode,
             offset=offset,
             limit=limit,
-            fields=fields,
+            fields=page_fields(fields, format, normalize),
             sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            districts, offset, limit, meta=meta, count_only=countOnly, format=format, fields=fields, normalize=normalize
         )
-        return {"status": "OK", "data": districts}
     except HTTPException as e:
         raise e
     except Exception:
@@ -51,6 +72,68 @@ async def get_districts(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.get("/districts/batch")
+async def get_districts_by_ids(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    activatePostalCodes: bool = Query(False, description="Activate postal codes"),
+):
+    try:
+        districts, missing = district_service.get_districts_by_ids(
+            ids=district_service.parse_ids(ids), fields=fields, activate_postal_codes=activatePostalCodes
+        )
+        return batch_response(districts, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_districts_by_ids")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/districts/batch")
+async def post_districts_batch(
+    batch: BatchRequest,
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    activatePostalCodes: bool = Query(False, description="Activate postal codes"),
+):
+    try:
+        districts, missing = district_service.get_districts_by_ids(
+            ids=batch.ids, fields=fields, activate_postal_codes=activatePostalCodes
+        )
+        return batch_response(districts, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_districts_batch")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/districts/ancestry")
+async def get_districts_ancestries(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+):
+    try:
+        ancestries, missing = district_service.get_districts_ancestries(ids=district_service.parse_ids(ids))
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_districts_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/districts/ancestry")
+async def post_districts_ancestries(batch: BatchRequest):
+    try:
+        ancestries, missing = district_service.get_districts_ancestries(ids=batch.ids)
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_districts_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/districts/{id}")
 async def get_exact_district(
     id: int = Path(..., description="The district ID"),
@@ -58,12 +141,156 @@ async def get_exact_district(
     activatePostalCodes: bool = Query(False, description="Activate postal codes"),
 ):
     try:
+        if not fields:
+            response_format = negotiated_format()
+            return document_response(
+                district_service.get_exact_district_document(
+                    district_id=id, activate_postal_codes=activatePostalCodes, format=response_format
+                ),
+                response_format,
+            )
+
         district = district_service.get_exact_district(
             district_id=id, fields=fields, activate_postal_codes=activatePostalCodes
         )
-        return {"status": "OK", "data": district}
+        return envelope_response({"status": "OK", "data": district})
     except HTTPException as e:
         raise e
     except Exception:
         logger.exception("Unexpected error in get_exact_district")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/districts/{id}/ancestry")
+async def get_district_ancestry(
+    id: int = Path(..., description="The district ID"),
+):
+    try:
+        ancestry = district_service.get_district_ancestry(district_id=id)
+        return envelope_response({"status": "OK", "data": ancestry})
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_district_ancestry")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/districts/{id}/neighborhoods")
+async def get_district_neighborhoods(
+    id: int = Path(..., description="The district ID"),
+    offset: int = Query(0, ge=0, le=100000, description="The offset of the neighborhoods list"),
+    limit: int = Query(10000, ge=1, le=50000, description="The limit of the neighborhoods list"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    sort: Optional[str] = Query(
+        None, description="The sorting of the neighborhoods list (put '-' before the field name for descending order)"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
+):
+    try:
+        neighborhoods = district_service.get_district_neighborhoods(
+            district_id=id,
+            offset=offset,
+            limit=limit,
+            fields=page_fields(fields, format, normalize),
+            sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            neighborhoods,
+            offset,
+            limit,
+            meta=meta,
+            count_only=countOnly,
+            format=format,
+            fields=fields,
+            normalize=normalize,
+        )
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_district_neighborhoods")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/districts/{id}/villages")
+async def get_district_villages(
+    id: int = Path(..., description="The district ID"),
+    offset: int = Query(0, ge=0, le=100000, description="The offset of the villages list"),
+    limit: int = Query(10000, ge=1, le=50000, description="The limit of the villages list"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    sort: Optional[str] = Query(
+        None, description="The sorting of the villages list (put '-' before the field name for descending order)"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
+):
+    try:
+        villages = district_service.get_district_villages(
+            district_id=id,
+            offset=offset,
+            limit=limit,
+            fields=page_fields(fields, format, normalize),
+            sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            villages, offset, limit, meta=meta, count_only=countOnly, format=format, fields=fields, normalize=normalize
+        )
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_district_villages")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/districts/{id}/towns")
+async def get_district_towns(
+    id: int = Path(..., description="The district ID"),
+    offset: int = Query(0, ge=0, le=100000, description="The offset of the towns list"),
+    limit: int = Query(10000, ge=1, le=10000, description="The limit of the towns list"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    sort: Optional[str] = Query(
+        None, description="The sorting of the towns list (put '-' before the field name for descending order)"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
+):
+    try:
+        towns = district_service.get_district_towns(
+            district_id=id,
+            offset=offset,
+            limit=limit,
+            fields=page_fields(fields, format, normalize),
+            sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            towns, offset, limit, meta=meta, count_only=countOnly, format=format, fields=fields, normalize=normalize
+        )
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_district_towns")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
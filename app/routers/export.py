@@ -0,0 +1,63 @@
+import logging
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.services.export_service import EXPORT_MEDIA_TYPES, TREE_MEDIA_TYPES, export_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/export/tree")
+async def export_tree(
+    format: str = Query("json", description="The export format (json or ndjson)"),
+    activatePostalCodes: bool = Query(False, description="Activate postal codes"),
+):
+    try:
+        chunks = export_service.tree(format=format, postal_codes=activatePostalCodes)
+        return StreamingResponse(chunks, media_type=TREE_MEDIA_TYPES[format])
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in export_tree")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/export/{entity}.{format}")
+async def export_entity(
+    request: Request,
+    entity: str = Path(
+        ..., description="The entity to export (provinces, districts, neighborhoods, villages or towns)"
+    ),
+    format: str = Path(..., description="The export format (ndjson, csv, parquet or arrow)"),
+):
+    try:
+        # Every other query parameter is a filter of the entity's list endpoint
+        chunks = export_service.entity(entity, format, dict(request.query_params))
+        return StreamingResponse(
+            chunks,
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+        )
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in export_entity")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/arrow/{entity}")
+async def export_arrow(
+    request: Request,
+    entity: str = Path(..., description="The entity to load (provinces, districts, neighborhoods, villages or towns)"),
+):
+    try:
+        # Every query parameter is a filter of the entity's list endpoint
+        chunks = export_service.entity(entity, "arrow", dict(request.query_params))
+        return StreamingResponse(chunks, media_type=EXPORT_MEDIA_TYPES["arrow"])
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in export_arrow")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
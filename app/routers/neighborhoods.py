@@ -3,6 +3,8 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Path, Query
 
+from app.models.schemas import BatchRequest
+from app.responses import batch_response, envelope_response, list_response, page_fields
 from app.services.neighborhood_service import neighborhood_service
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,13 @@ async def get_neighborhoods(
     sort: Optional[str] = Query(
         None, description="The sorting of the neighborhoods list (put '-' before the field name for descending order)"
     ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
 ):
     try:
         neighborhoods = neighborhood_service.get_neighborhoods(
@@ -36,10 +45,22 @@ async def get_neighborhoods(
             district=district,
             offset=offset,
             limit=limit,
-            fields=fields,
+            fields=page_fields(fields, format, normalize),
             sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            neighborhoods,
+            offset,
+            limit,
+            meta=meta,
+            count_only=countOnly,
+            format=format,
+            fields=fields,
+            normalize=normalize,
         )
-        return {"status": "OK", "data": neighborhoods}
     except HTTPException as e:
         raise e
     except Exception:
@@ -47,6 +68,64 @@ async def get_neighborhoods(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.get("/neighborhoods/batch")
+async def get_neighborhoods_by_ids(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+):
+    try:
+        neighborhoods, missing = neighborhood_service.get_neighborhoods_by_ids(
+            ids=neighborhood_service.parse_ids(ids), fields=fields
+        )
+        return batch_response(neighborhoods, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_neighborhoods_by_ids")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/neighborhoods/batch")
+async def post_neighborhoods_batch(
+    batch: BatchRequest,
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+):
+    try:
+        neighborhoods, missing = neighborhood_service.get_neighborhoods_by_ids(ids=batch.ids, fields=fields)
+        return batch_response(neighborhoods, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_neighborhoods_batch")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/neighborhoods/ancestry")
+async def get_neighborhoods_ancestries(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+):
+    try:
+        ancestries, missing = neighborhood_service.get_neighborhoods_ancestries(ids=neighborhood_service.parse_ids(ids))
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_neighborhoods_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/neighborhoods/ancestry")
+async def post_neighborhoods_ancestries(batch: BatchRequest):
+    try:
+        ancestries, missing = neighborhood_service.get_neighborhoods_ancestries(ids=batch.ids)
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_neighborhoods_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/neighborhoods/{id}")
 async def get_exact_neighborhood(
     id: int = Path(..., description="The neighborhood ID"),
@@ -54,9 +133,23 @@ async def get_exact_neighborhood(
 ):
     try:
         neighborhood = neighborhood_service.get_exact_neighborhood(neighborhood_id=id, fields=fields)
-        return {"status": "OK", "data": neighborhood}
+        return envelope_response({"status": "OK", "data": neighborhood})
     except HTTPException as e:
         raise e
     except Exception:
         logger.exception("Unexpected error in get_exact_neighborhood")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/neighborhoods/{id}/ancestry")
+async def get_neighborhood_ancestry(
+    id: int = Path(..., description="The neighborhood ID"),
+):
+    try:
+        ancestry = neighborhood_service.get_neighborhood_ancestry(neighborhood_id=id)
+        return envelope_response({"status": "OK", "data": ancestry})
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_neighborhood_ancestry")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
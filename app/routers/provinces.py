@@ -3,6 +3,15 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Path, Query
 
+from app.models.schemas import BatchRequest
+from app.responses import (
+    batch_response,
+    document_response,
+    envelope_response,
+    list_response,
+    negotiated_format,
+    page_fields,
+)
 from app.services.province_service import province_service
 
 logger = logging.getLogger(__name__)
@@ -28,6 +37,13 @@ async def get_provinces(
     sort: Optional[str] = Query(
         None, description="The sorting of the provinces list (put '-' before the field name for descending order)"
     ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
 ):
     try:
         provinces = province_service.get_provinces(
@@ -44,10 +60,15 @@ async def get_provinces(
             postal_code=postalCode,
             offset=offset,
             limit=limit,
-            fields=fields,
+            fields=page_fields(fields, format, normalize),
             sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            provinces, offset, limit, meta=meta, count_only=countOnly, format=format, fields=fields, normalize=normalize
         )
-        return {"status": "OK", "data": provinces}
     except HTTPException as e:
         raise e
     except Exception:
@@ -55,6 +76,42 @@ async def get_provinces(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.get("/provinces/batch")
+async def get_provinces_by_ids(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    activatePostalCodes: bool = Query(False, description="Activate postal codes"),
+):
+    try:
+        provinces, missing = province_service.get_provinces_by_ids(
+            ids=province_service.parse_ids(ids), fields=fields, activate_postal_codes=activatePostalCodes
+        )
+        return batch_response(provinces, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_provinces_by_ids")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/provinces/batch")
+async def post_provinces_batch(
+    batch: BatchRequest,
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    activatePostalCodes: bool = Query(False, description="Activate postal codes"),
+):
+    try:
+        provinces, missing = province_service.get_provinces_by_ids(
+            ids=batch.ids, fields=fields, activate_postal_codes=activatePostalCodes
+        )
+        return batch_response(provinces, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_provinces_batch")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/provinces/{id}")
 async def get_exact_province(
     id: int = Path(..., description="The province ID / plate number"),
@@ -63,11 +120,105 @@ async def get_exact_province(
     activatePostalCodes: bool = Query(False, description="Activate postal codes"),
 ):
     try:
+        if not fields:
+            response_format = negotiated_format()
+            return document_response(
+                province_service.get_exact_province_document(
+                    province_id=id, extend=extend, activate_postal_codes=activatePostalCodes, format=response_format
+                ),
+                response_format,
+            )
+
         province = province_service.get_exact_province(
             province_id=id, fields=fields, extend=extend, activate_postal_codes=activatePostalCodes
         )
-        return {"status": "OK", "data": province}
+        return envelope_response({"status": "OK", "data": province})
+    except HTTPException as e:
+        raise e
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/provinces/{id}/districts")
+async def get_province_districts(
+    id: int = Path(..., description="The province ID"),
+    offset: int = Query(0, ge=0, le=100000, description="The offset of the districts list"),
+    limit: int = Query(1000, ge=1, le=1000, description="The limit of the districts list"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    sort: Optional[str] = Query(
+        None, description="The sorting of the districts list (put '-' before the field name for descending order)"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
+    activatePostalCodes: bool = Query(False, description="Activate postal codes"),
+):
+    try:
+        districts = province_service.get_province_districts(
+            province_id=id,
+            offset=offset,
+            limit=limit,
+            fields=page_fields(fields, format, normalize),
+            sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+            activate_postal_codes=activatePostalCodes,
+        )
+        return list_response(
+            districts, offset, limit, meta=meta, count_only=countOnly, format=format, fields=fields, normalize=normalize
+        )
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_province_districts")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/provinces/{id}/neighborhoods")
+async def get_province_neighborhoods(
+    id: int = Path(..., description="The province ID"),
+    offset: int = Query(0, ge=0, le=100000, description="The offset of the neighborhoods list"),
+    limit: int = Query(10000, ge=1, le=50000, description="The limit of the neighborhoods list"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+    sort: Optional[str] = Query(
+        None, description="The sorting of the neighborhoods list (put '-' before the field name for descending order)"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
+):
+    try:
+        neighborhoods = province_service.get_province_neighborhoods(
+            province_id=id,
+            offset=offset,
+            limit=limit,
+            fields=page_fields(fields, format, normalize),
+            sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            neighborhoods,
+            offset,
+            limit,
+            meta=meta,
+            count_only=countOnly,
+            format=format,
+            fields=fields,
+            normalize=normalize,
+        )
     except HTTPException as e:
         raise e
     except Exception:
+        logger.exception("Unexpected error in get_province_neighborhoods")
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,22 @@
+import logging
+
+from fastapi import APIRouter, HTTPException
+
+from app.models.schemas import CompoundQuery
+from app.responses import envelope_response
+from app.services.query_service import query_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post("/query")
+async def run_compound_query(query: CompoundQuery):
+    try:
+        results = query_service.run(query.queries)
+        return envelope_response({"status": "OK", "data": results})
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in run_compound_query")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
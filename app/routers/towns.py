@@ -3,6 +3,8 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Path, Query
 
+from app.models.schemas import BatchRequest
+from app.responses import batch_response, envelope_response, list_response, page_fields
 from app.services.town_service import town_service
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,13 @@ async def get_towns(
     sort: Optional[str] = Query(
         None, description="The sorting of the towns list (put '-' before the field name for descending order)"
     ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
 ):
     try:
         towns = town_service.get_towns(
@@ -36,10 +45,15 @@ async def get_towns(
             district=district,
             offset=offset,
             limit=limit,
-            fields=fields,
+            fields=page_fields(fields, format, normalize),
             sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            towns, offset, limit, meta=meta, count_only=countOnly, format=format, fields=fields, normalize=normalize
         )
-        return {"status": "OK", "data": towns}
     except HTTPException as e:
         raise e
     except Exception:
@@ -47,6 +61,62 @@ async def get_towns(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.get("/towns/batch")
+async def get_towns_by_ids(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+):
+    try:
+        towns, missing = town_service.get_towns_by_ids(ids=town_service.parse_ids(ids), fields=fields)
+        return batch_response(towns, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_towns_by_ids")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/towns/batch")
+async def post_towns_batch(
+    batch: BatchRequest,
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+):
+    try:
+        towns, missing = town_service.get_towns_by_ids(ids=batch.ids, fields=fields)
+        return batch_response(towns, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_towns_batch")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/towns/ancestry")
+async def get_towns_ancestries(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+):
+    try:
+        ancestries, missing = town_service.get_towns_ancestries(ids=town_service.parse_ids(ids))
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_towns_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/towns/ancestry")
+async def post_towns_ancestries(batch: BatchRequest):
+    try:
+        ancestries, missing = town_service.get_towns_ancestries(ids=batch.ids)
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_towns_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/towns/{id}")
 async def get_exact_town(
     id: int = Path(..., description="The town ID"),
@@ -54,9 +124,23 @@ async def get_exact_town(
 ):
     try:
         town = town_service.get_exact_town(town_id=id, fields=fields)
-        return {"status": "OK", "data": town}
+        return envelope_response({"status": "OK", "data": town})
     except HTTPException as e:
         raise e
     except Exception:
         logger.exception("Unexpected error in get_exact_town")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/towns/{id}/ancestry")
+async def get_town_ancestry(
+    id: int = Path(..., description="The town ID"),
+):
+    try:
+        ancestry = town_service.get_town_ancestry(town_id=id)
+        return envelope_response({"status": "OK", "data": ancestry})
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_town_ancestry")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
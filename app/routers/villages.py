@@ -3,6 +3,8 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Path, Query
 
+from app.models.schemas import BatchRequest
+from app.responses import batch_response, envelope_response, list_response, page_fields
 from app.services.village_service import village_service
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,13 @@ async def get_villages(
     sort: Optional[str] = Query(
         None, description="The sorting of the villages list (put '-' before the field name for descending order)"
     ),
+    cursor: Optional[str] = Query(
+        None, description="The cursor of the next page (nextCursor of the previous response)"
+    ),
+    meta: bool = Query(False, description="Include pagination metadata (total, offset, limit, hasMore)"),
+    countOnly: bool = Query(False, description="Return only the number of matching records"),
+    format: str = Query("objects", description="The layout of the data (objects, columns or rows)"),
+    normalize: bool = Query(False, description="Replace parent names with ids and a names side table"),
 ):
     try:
         villages = village_service.get_villages(
@@ -36,10 +45,15 @@ async def get_villages(
             district=district,
             offset=offset,
             limit=limit,
-            fields=fields,
+            fields=page_fields(fields, format, normalize),
             sort=sort,
+            cursor=cursor,
+            with_total=meta,
+            count_only=countOnly,
+        )
+        return list_response(
+            villages, offset, limit, meta=meta, count_only=countOnly, format=format, fields=fields, normalize=normalize
         )
-        return {"status": "OK", "data": villages}
     except HTTPException as e:
         raise e
     except Exception:
@@ -47,6 +61,62 @@ async def get_villages(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.get("/villages/batch")
+async def get_villages_by_ids(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+):
+    try:
+        villages, missing = village_service.get_villages_by_ids(ids=village_service.parse_ids(ids), fields=fields)
+        return batch_response(villages, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_villages_by_ids")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/villages/batch")
+async def post_villages_batch(
+    batch: BatchRequest,
+    fields: Optional[str] = Query(None, description="The fields to be returned (comma separated)"),
+):
+    try:
+        villages, missing = village_service.get_villages_by_ids(ids=batch.ids, fields=fields)
+        return batch_response(villages, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_villages_batch")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/villages/ancestry")
+async def get_villages_ancestries(
+    ids: str = Query(..., description="The IDs to look up (comma separated)"),
+):
+    try:
+        ancestries, missing = village_service.get_villages_ancestries(ids=village_service.parse_ids(ids))
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_villages_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/villages/ancestry")
+async def post_villages_ancestries(batch: BatchRequest):
+    try:
+        ancestries, missing = village_service.get_villages_ancestries(ids=batch.ids)
+        return batch_response(ancestries, missing)
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in post_villages_ancestries")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/villages/{id}")
 async def get_exact_village(
     id: int = Path(..., description="The village ID"),
@@ -54,9 +124,23 @@ async def get_exact_village(
 ):
     try:
         village = village_service.get_exact_village(village_id=id, fields=fields)
-        return {"status": "OK", "data": village}
+        return envelope_response({"status": "OK", "data": village})
     except HTTPException as e:
         raise e
     except Exception:
         logger.exception("Unexpected error in get_exact_village")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/villages/{id}/ancestry")
+async def get_village_ancestry(
+    id: int = Path(..., description="The village ID"),
+):
+    try:
+        ancestry = village_service.get_village_ancestry(village_id=id)
+        return envelope_response({"status": "OK", "data": ancestry})
+    except HTTPException as e:
+        raise e
+    except Exception:
+        logger.exception("Unexpected error in get_village_ancestry")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,188 @@
+"""
+Pre-compressed full-dataset responses.
+
+Unfiltered list requests (every province, the first page of every
+neighborhood, ...) get the same response whoever asks. Their JSON bodies are
+rendered once at startup by the application itself, so they are
+byte-for-byte what the endpoints return, and compressed once in every
+available content coding (see PrecompressedMiddleware, which serves them).
+The renders leave out the user middleware, so they are not rate limited,
+counted in the request metrics or compressed on the way.
+"""
+
+import asyncio
+import copy
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from app.config import PRECOMPRESSED_REQUESTS
+from app.responses import set_response_format
+from app.services.compression import IDENTITY, available_codings, compress
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Artifact:
+    """Response body of a full-dataset request in every content coding built so far."""
+
+    __slots__ = ("media_type", "digest", "bodies")
+
+    def __init__(self, body: bytes, media_type: str):
+        """
+        Wrap an uncompressed response body.
+
+        Args:
+            body: Uncompressed response body
+            media_type: Content-Type of the response
+        """
+        self.media_type = media_type
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        # Replaced as a whole when a coding is added, so readers never see it change size
+        self.bodies: Dict[str, bytes] = {IDENTITY: body}
+
+    def etag(self, coding: str) -> str:
+        """
+        Get the entity tag of the body in a content coding.
+
+        Args:
+            coding: Coding name, one of compression.CODINGS or IDENTITY
+
+        Returns:
+            Quoted strong entity tag, distinct for every coding
+        """
+        return f'"{self.digest}"' if coding == IDENTITY else f'"{self.digest}-{coding}"'
+
+
+class ArtifactService:
+    """Service building and looking up the pre-compressed full-dataset responses."""
+
+    def __init__(self):
+        self._artifacts: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Artifact] = {}
+
+    def __len__(self) -> int:
+        return len(self._artifacts)
+
+    def get(self, path: str, query_string: str = "") -> Optional[Artifact]:
+        """
+        Find the pre-built response of a request.
+
+        Args:
+            path: Request path
+            query_string: Raw query string (parameter order does not matter)
+
+        Returns:
+            Artifact, or None if the request has no pre-built response
+        """
+        return self._artifacts.get(_key(path, query_string))
+
+    async def build(
+        self,
+        app: Any,
+        requests: Iterable[str] = PRECOMPRESSED_REQUESTS,
+        levels: Optional[Mapping[str, int]] = None,
+    ) -> int:
+        """
+        Render the full-dataset responses and compress them.
+
+        The uncompressed bodies are published as soon as they are rendered;
+        every coding is then compressed in a worker thread and published when
+        ready, so a build never blocks the event loop. Building again
+        replaces all previous artifacts at once.
+
+        Args:
+            app: FastAPI application rendering the responses
+            requests: Request paths, with query strings where needed
+            levels: Compression level of each coding (settings.precompressed_levels by default)
+
+        Returns:
+            Number of requests with a pre-built response
+        """
+        levels = settings.precompressed_levels if levels is None else levels
+        renderer = _without_user_middleware(app)
+        # Rendered as JSON whatever format the calling context negotiated
+        set_response_format("json")
+
+        artifacts = {}
+        unique: Dict[str, Artifact] = {}
+        for request in requests:
+            path, _, query_string = request.partition("?")
+            status, media_type, body = await _render(renderer, path, query_string)
+            if status != 200:
+                logger.warning(f"Skipping pre-compressed response of {request}: status {status}")
+                continue
+            # Requests spelling out a default parameter share the body of the bare request
+            artifact = Artifact(body, media_type)
+            artifacts[_key(path, query_string)] = unique.setdefault(artifact.digest, artifact)
+
+        self._artifacts = artifacts
+        await asyncio.get_running_loop().run_in_executor(None, self._compress, list(unique.values()), levels)
+        logger.info(f"Pre-compressed {len(artifacts)} full-dataset responses ({', '.join(available_codings())})")
+        return len(artifacts)
+
+    @staticmethod
+    def _compress(artifacts: List[Artifact], levels: Mapping[str, int]) -> None:
+        for coding in available_codings():
+            for artifact in artifacts:
+                body = compress(artifact.bodies[IDENTITY], coding, levels[coding])
+                artifact.bodies = {**artifact.bodies, coding: body}
+
+
+def _key(path: str, query_string: str) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    return path, tuple(sorted(parse_qsl(query_string, keep_blank_values=True)))
+
+
+def _without_user_middleware(app: Any) -> Any:
+    """Copy the application without its user middleware (it builds its own stack on the first request)."""
+    renderer = copy.copy(app)
+    renderer.user_middleware = []
+    renderer.middleware_stack = None
+    return renderer
+
+
+async def _render(app: Any, path: str, query_string: str) -> Tuple[int, str, bytes]:
+    """Run a GET request through the application and collect the response."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "root_path": "",
+        "query_string": query_string.encode("latin-1"),
+        "headers": [(b"accept", b"application/json")],
+        "client": None,
+        "server": None,
+    }
+    start: Dict[str, Any] = {}
+    parts: List[bytes] = []
+    requested = False
+    complete = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        # The empty request body, then a disconnect once the response is complete (streamed responses wait for it)
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            parts.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                complete.set()
+
+    await app(scope, receive, send)
+    headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in start.get("headers", [])}
+    return start.get("status", 500), headers.get("content-type", "application/json"), b"".join(parts)
+
+
+artifact_service = ArtifactService()
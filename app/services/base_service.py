@@ -5,16 +5,81 @@ This module provides common functionality for filtering, sorting,
 and validating data across all service classes.
 """
 
+import base64
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
 
+from app.config import MAX_BATCH_IDS
+from app.services.collation import COLLATED_FIELDS, collation_key
 from app.services.data_loader import data_loader
+from app.services.indexes import SortOrder, bitmap_count, bitmap_from_positions, bitmap_positions
+from app.services.projection import compile_fields
 
 logger = logging.getLogger(__name__)
 
 
+class Page(list):
+    """
+    Records of one result page with pagination metadata.
+
+    Routers read ``next_cursor`` and ``total`` for the envelope; pages of whole
+    records also know their rows, so responses can use the pre-encoded ``fragments``.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Dict[str, Any]] = (),
+        next_cursor: Optional[str] = None,
+        total: Optional[int] = None,
+        source: Optional[Tuple[str, bool, Sequence[int]]] = None,
+    ):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.total = total
+        self.source = source
+
+    def fragments(self, format: str = "json", normalized: bool = False) -> Optional[List[bytes]]:
+        """Get the pre-encoded records of the page (None if it holds projected or cached records)."""
+        if self.source is None:
+            return None
+        entity, postal_codes, positions = self.source
+        fragments = data_loader.fragments(entity, postal_codes, format, normalized)
+        return [fragments[position] for position in positions]
+
+    def column(self, field: str) -> Optional[List[Any]]:
+        """Get the values of a field for the page's records (None if they are projected or cached)."""
+        if self.source is None:
+            return None
+        entity, postal_codes, positions = self.source
+        values = data_loader.columns(entity, postal_codes).get(field)
+        if values is None:
+            return None
+        if self.is_whole_view():
+            return values
+        return list(map(values.__getitem__, positions))
+
+    def parent_names(self) -> Dict[str, Dict[str, str]]:
+        """Map the ancestors of the page's records to their names (empty for projected or cached records)."""
+        if self.source is None:
+            return {}
+        entity, _, positions = self.source
+        return data_loader.parent_names(entity, positions)
+
+    def is_whole_view(self) -> bool:
+        """Check whether the page holds every row of its entity's view, in row order."""
+        if self.source is None:
+            return False
+        entity, postal_codes, positions = self.source
+        rows = range(len(data_loader.view(entity, postal_codes)))
+        if len(positions) != len(rows):
+            return False
+        return positions == rows if isinstance(positions, range) else list(positions) == list(rows)
+
+
 class BaseService:
     """Base service with shared utility methods for data operations."""
 
@@ -28,7 +93,7 @@ class BaseService:
 
         Args:
             item: Dictionary to filter
-            fields: Comma-separated list of field names to include
+            fields: Comma-separated list of field names (or dotted paths to nested fields) to include
 
         Returns:
             Dictionary with only the specified fields
@@ -36,16 +101,363 @@ class BaseService:
         if not fields:
             return item
 
-        field_list = [f.strip() for f in fields.split(",")]
-        return {k: v for k, v in item.items() if k in field_list}
+        return compile_fields(fields)(item)
+
+    def _select_rows(
+        self,
+        entity: str,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        equals: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """Combine the indexed range and equality filters into one row bitmap (None if there are none)."""
+        rows = None
+
+        for field, (min_value, max_value) in (ranges or {}).items():
+            bitmap = self.data_loader.range_index(entity, field).bitmap(min_value, max_value)
+            rows = bitmap if rows is None else rows & bitmap
+
+        for field, value in (equals or {}).items():
+            if value is None:
+                continue
+            bitmap = self.data_loader.bitmap_index(entity, field).get(value)
+            rows = bitmap if rows is None else rows & bitmap
+
+        return rows
+
+    def _records_for_rows(self, entity: str, rows: Optional[int]) -> List[Dict[str, Any]]:
+        """Resolve a row bitmap (None for every row) to records in dataset order."""
+        records = self.data_loader.records(entity)
+        if rows is None:
+            return records
+        return [records[position] for position in bitmap_positions(rows)]
+
+    def _get_position(self, entity: str, record_id: int, not_found: str) -> int:
+        """Find the row position of a record by id."""
+        position = self.data_loader.id_index(entity).get(record_id)
+        if position is None:
+            raise HTTPException(status_code=404, detail=not_found)
+        return position
+
+    def _get_record(
+        self, entity: str, record_id: int, not_found: str, postal_codes: bool = True, extend: bool = False
+    ) -> Dict[str, Any]:
+        """Look up the shared detail document of a record by id."""
+        position = self._get_position(entity, record_id, not_found)
+        return self.data_loader.detail_view(entity, postal_codes, extend)[position]
+
+    def _get_document(
+        self,
+        entity: str,
+        record_id: int,
+        not_found: str,
+        postal_codes: bool = True,
+        extend: bool = False,
+        format: str = "json",
+    ) -> bytes:
+        """Look up the encoded detail document of a record by id."""
+        position = self._get_position(entity, record_id, not_found)
+        return self.data_loader.detail_documents(entity, postal_codes, extend, format)[position]
+
+    def _get_records_by_ids(
+        self, entity: str, ids: List[int], fields: Optional[str] = None, postal_codes: bool = True
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Look up many records by id, returning them in input order with the ids that do not exist."""
+        if len(ids) > MAX_BATCH_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids can be requested at once")
+
+        index = self.data_loader.id_index(entity)
+        view = self.data_loader.view(entity, postal_codes)
+        records, missing = [], []
+        for record_id in ids:
+            position = index.get(record_id)
+            if position is None:
+                missing.append(record_id)
+            else:
+                records.append(view[position])
+
+        if fields:
+            records = compile_fields(fields).page(records)
+
+        return records, missing
+
+    def _get_ancestry(self, entity: str, record_id: int, not_found: str) -> List[Dict[str, Any]]:
+        """Get the summaries from the province down to a record."""
+        return self.data_loader.ancestry(entity, self._get_position(entity, record_id, not_found))
+
+    def _get_ancestries(self, entity: str, ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Get the ancestry of many records, with the ids that do not exist."""
+        if len(ids) > MAX_BATCH_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids can be requested at once")
+
+        index = self.data_loader.id_index(entity)
+        items, missing = [], []
+        for record_id in ids:
+            position = index.get(record_id)
+            if position is None:
+                missing.append(record_id)
+            else:
+                items.append({"id": record_id, "ancestry": self.data_loader.ancestry(entity, position)})
+        return items, missing
+
+    @staticmethod
+    def parse_ids(ids: str) -> List[int]:
+        """Parse a comma-separated list of ids."""
+        try:
+            return [int(part) for part in ids.split(",") if part.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+
+    @staticmethod
+    def _text_filter(field: str, value: str) -> Callable[[Dict[str, Any]], bool]:
+        """Build a partial-match filter on a text field (the capitalized value also matches)."""
+        value_alt = value.capitalize()
+        return lambda item: value in item[field] or value_alt in item[field]
+
+    def _query_records(
+        self,
+        entity: str,
+        rows: Optional[int],
+        filters: List[Callable[[Dict[str, Any]], bool]],
+        sort: Optional[str],
+        offset: int,
+        limit: int,
+        not_found: str,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        with_total: bool = False,
+        postal_codes: bool = True,
+    ) -> Page:
+        """
+        Filter, sort and paginate the records of indexed rows.
+
+        Cursor pages seek from the cursor row and only count every match with with_total.
+        """
+        if cursor:
+            if offset:
+                raise HTTPException(status_code=400, detail="offset cannot be combined with cursor")
+            page = self._seek_records(entity, rows, filters, sort, limit, cursor, fields, postal_codes)
+            if with_total:
+                page.total = self._count_rows(entity, rows, filters, postal_codes)
+            return page
+
+        records = self.data_loader.view(entity, postal_codes)
+
+        if not filters and not sort:
+            total = len(records) if rows is None else bitmap_count(rows)
+            if not total:
+                raise HTTPException(status_code=404, detail=not_found)
+            if rows is None:
+                positions = range(offset, min(offset + limit + 1, len(records)))
+            else:
+                positions = bitmap_positions(rows, offset, limit + 1)
+            return self._make_page(entity, positions, sort, limit, fields, total, postal_codes)
+
+        positions = range(len(records)) if rows is None else bitmap_positions(rows)
+        for matches in filters:
+            positions = [position for position in positions if matches(records[position])]
+
+        if not positions:
+            raise HTTPException(status_code=404, detail=not_found)
+
+        if sort:
+            order = self._sort_order(entity, sort, postal_codes)
+            if len(positions) == len(records):
+                positions = order.positions
+            else:
+                positions = sorted(positions, key=order.ranks.__getitem__)
+
+        window = positions[offset : offset + limit + 1]
+        return self._make_page(entity, window, sort, limit, fields, len(positions), postal_codes)
+
+    def _get_children(
+        self,
+        parent: str,
+        parent_id: int,
+        parent_not_found: str,
+        entity: str,
+        foreign_key: str,
+        sort: Optional[str],
+        offset: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+        postal_codes: bool = True,
+    ) -> Page:
+        """List the children of a record from the hierarchy index (an empty page if it has none)."""
+        self._get_position(parent, parent_id, parent_not_found)
+        positions = self.data_loader.children_index(entity, foreign_key).get(parent_id, [])
+
+        if count_only:
+            return Page(total=len(positions))
+
+        records = self.data_loader.view(entity, postal_codes)
+        if cursor:
+            if offset:
+                raise HTTPException(status_code=400, detail="offset cannot be combined with cursor")
+            rows = bitmap_from_positions(positions, len(records))
+            page = self._seek_records(entity, rows, [], sort, limit, cursor, fields, postal_codes)
+            if with_total:
+                page.total = len(positions)
+            return page
+
+        if sort:
+            positions = sorted(positions, key=self._sort_order(entity, sort, postal_codes).ranks.__getitem__)
+
+        window = positions[offset : offset + limit + 1]
+        return self._make_page(entity, window, sort, limit, fields, len(positions), postal_codes)
+
+    def _seek_records(
+        self,
+        entity: str,
+        rows: Optional[int],
+        filters: List[Callable[[Dict[str, Any]], bool]],
+        sort: Optional[str],
+        limit: int,
+        cursor: str,
+        fields: Optional[str],
+        postal_codes: bool = True,
+    ) -> Page:
+        """Fetch the page after a cursor, walking the sort order from the cursor row."""
+        records = self.data_loader.view(entity, postal_codes)
+        key, row_id = self._decode_cursor(cursor, sort)
+        after = self.data_loader.id_index(entity).get(row_id)
+        if after is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        self._check_cursor_row(records[after], sort, key)
+
+        candidates: Iterable[int]
+        if sort:
+            order = self._sort_order(entity, sort, postal_codes)
+            rank = order.ranks[after]
+            if rows is None:
+                candidates = (order.positions[index] for index in range(rank + 1, len(records)))
+            else:
+                later = [position for position in bitmap_positions(rows) if order.ranks[position] > rank]
+                candidates = sorted(later, key=order.ranks.__getitem__)
+        elif rows is None:
+            candidates = range(after + 1, len(records))
+        else:
+            candidates = bitmap_positions(rows >> (after + 1) << (after + 1))
+
+        if filters:
+            candidates = (position for position in candidates if all(matches(records[position]) for matches in filters))
+
+        window = list(islice(candidates, limit + 1))
+        return self._make_page(entity, window, sort, limit, fields, postal_codes=postal_codes)
+
+    def _make_page(
+        self,
+        entity: str,
+        window: Sequence[int],
+        sort: Optional[str],
+        limit: int,
+        fields: Optional[str],
+        total: Optional[int] = None,
+        postal_codes: bool = True,
+    ) -> Page:
+        """Build a page from the rows of up to limit + 1 items (the extra one only signals a next page)."""
+        records = self.data_loader.view(entity, postal_codes)
+        positions = window[:limit]
+        items = [records[position] for position in positions]
+        next_cursor = self._encode_cursor(sort, items[-1]) if len(window) > limit and items else None
+
+        if fields:
+            return Page(compile_fields(fields).page(items), next_cursor=next_cursor, total=total)
+
+        return Page(items, next_cursor=next_cursor, total=total, source=(entity, postal_codes, positions))
+
+    def _count_rows(
+        self,
+        entity: str,
+        rows: Optional[int],
+        filters: List[Callable[[Dict[str, Any]], bool]],
+        postal_codes: bool = True,
+    ) -> int:
+        """Count the matching records without building a page."""
+        records = self.data_loader.view(entity, postal_codes)
+        if not filters:
+            return len(records) if rows is None else bitmap_count(rows)
+
+        positions = range(len(records)) if rows is None else bitmap_positions(rows)
+        return sum(1 for position in positions if all(matches(records[position]) for matches in filters))
+
+    def _encode_cursor(self, sort: Optional[str], item: Dict[str, Any]) -> str:
+        """Encode the sort key and id of the last item of a page as an opaque cursor."""
+        key = [item.get(field) for field, _ in self._parse_sort(sort)] if sort else None
+        payload = {"s": sort or "", "k": key, "i": item["id"]}
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    def _decode_cursor(self, cursor: str, sort: Optional[str]) -> Tuple[Any, Any]:
+        """Decode a cursor into (sort key, id), rejecting malformed ones and those of another sort."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if not isinstance(payload, dict):
+                raise ValueError("Cursor payload is not an object")
+            cursor_sort, key, row_id = payload["s"], payload["k"], payload["i"]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+        if cursor_sort != (sort or ""):
+            raise HTTPException(status_code=400, detail="The cursor was issued for a different sort order.")
+
+        # Forged cursors may hold well-formed JSON of the wrong shape
+        if sort:
+            valid_key = isinstance(key, list) and len(key) == len(self._parse_sort(sort))
+        else:
+            valid_key = key is None
+        if not valid_key or isinstance(row_id, bool) or not isinstance(row_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+        return key, row_id
+
+    def _check_cursor_row(self, item: Dict[str, Any], sort: Optional[str], key: Any) -> None:
+        """Reject a cursor whose row no longer holds the sort key it encodes."""
+        if sort and [item.get(field) for field, _ in self._parse_sort(sort)] != key:
+            raise HTTPException(status_code=400, detail="The cursor is no longer valid.")
+
+    def _parse_sort(self, sort: str, sample: Optional[Dict[str, Any]] = None) -> List[Tuple[str, bool]]:
+        """Split a sort specification into (field, descending) pairs, most significant first."""
+        keys: List[Tuple[str, bool]] = []
+        for part in sort.split(","):
+            part = part.strip()
+            reverse = part.startswith("-")
+            field = part[1:] if reverse else part
+
+            # Validate field exists in data
+            if sample is not None and field not in sample:
+                available_fields = ", ".join(sorted(sample.keys()))
+                logger.warning(f"Sort field '{field}' not found in data. Available fields: {available_fields}")
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid sort field '{field}'. Available fields: {available_fields}"
+                )
+
+            if all(field != seen for seen, _ in keys):
+                keys.append((field, reverse))
+
+        return keys
+
+    def _sort_order(self, entity: str, sort: str, postal_codes: bool = True) -> SortOrder:
+        """Get the sort order of an entity for a sort specification."""
+        keys = self._parse_sort(sort, self.data_loader.view(entity, postal_codes)[0])
+        for field, _ in keys:
+            try:
+                self.data_loader.value_ranks(entity, field)
+            except TypeError as e:
+                logger.error(f"Sort error on field '{field}': {e}")
+                raise HTTPException(status_code=400, detail=f"Cannot sort by field '{field}': {str(e)}")
+        return self.data_loader.sort_order(entity, keys)
 
     def _sort_data(self, data: List[Dict], sort: Optional[str]) -> List[Dict]:
         """
-        Sort data by specified field.
+        Sort data by specified fields.
 
         Args:
             data: List of dictionaries to sort
-            sort: Field name to sort by. Prefix with '-' for descending order.
+            sort: Comma-separated field names to sort by. Prefix a field with '-' for descending order.
+                Name fields are sorted by the Turkish alphabet.
 
         Returns:
             Sorted list of dictionaries
@@ -60,31 +472,25 @@ class BaseService:
         if not data:
             return data
 
-        reverse = sort.startswith("-")
-        field = sort[1:] if reverse else sort
+        keys = self._parse_sort(sort, data[0])
 
-        # Validate field exists in data
-        if field not in data[0]:
-            available_fields = ", ".join(sorted(data[0].keys()))
-            logger.warning(f"Sort field '{field}' not found in data. Available fields: {available_fields}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid sort field '{field}'. Available fields: {available_fields}"
-            )
+        # Stable sorts from the least to the most significant field
+        for field, reverse in reversed(keys):
+            try:
+                if field in COLLATED_FIELDS:
+                    # Names follow the Turkish alphabet instead of code point order
+                    data = sorted(
+                        data, key=lambda x: (x.get(field) is None, collation_key(x.get(field) or "")), reverse=reverse
+                    )
+                    continue
 
-        try:
-            # Sort with proper handling of None values
-            return sorted(
-                data,
-                key=lambda x: (x.get(field) is None, x.get(field, "")),
-                reverse=reverse
-            )
-        except (TypeError, KeyError) as e:
-            logger.error(f"Sort error on field '{field}': {e}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cannot sort by field '{field}': {str(e)}"
-            )
+                # Sort with proper handling of None values
+                data = sorted(data, key=lambda x: (x.get(field) is None, x.get(field, "")), reverse=reverse)
+            except (TypeError, KeyError) as e:
+                logger.error(f"Sort error on field '{field}': {e}")
+                raise HTTPException(status_code=400, detail=f"Cannot sort by field '{field}': {str(e)}")
+
+        return data
 
     def validate_pagination(self, offset: int, limit: int, max_limit: int, max_offset: int = 100000) -> tuple[int, int]:
         """
@@ -0,0 +1,62 @@
+"""
+Turkish alphabetical collation for sorting place names.
+
+Python compares strings by code point, which puts Ç, Ğ, İ, Ö, Ş and Ü after Z
+and mixes up I/ı and İ/i. collation_key maps every letter to its position in
+the Turkish alphabet (a, b, c, ç, d, ..., h, ı, i, ..., s, ş, t, u, ü, ...)
+with a single ``str.translate`` call, so keys are cheap to build and compare.
+"""
+
+import unicodedata
+from typing import Dict, Tuple
+
+# Text fields sorted by Turkish collation instead of code point order
+COLLATED_FIELDS = frozenset({"name", "province", "district"})
+
+# Turkish alphabet, with q, w and x placed as in the Latin alphabet
+_ALPHABET = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+
+# Letters sorted like their base letter (the original text breaks ties)
+_EQUIVALENTS = {"â": "a", "ê": "e", "î": "i", "ô": "o", "û": "u"}
+
+# Weights live in the private use area, above every character left unmapped
+_WEIGHT_BASE = 0xF000
+
+
+def _build_table() -> Dict[int, str]:
+    weights = {letter: chr(_WEIGHT_BASE + index) for index, letter in enumerate(_ALPHABET)}
+    weights.update({letter: weights[base] for letter, base in _EQUIVALENTS.items()})
+
+    table = {}
+    for letter, weight in weights.items():
+        table[ord(letter)] = weight
+        table[ord(letter.upper())] = weight
+
+    # Turkish casing: I is the capital of ı, İ the capital of i
+    table[ord("I")] = weights["ı"]
+    table[ord("İ")] = weights["i"]
+
+    # Other accented Latin letters sort like their base letter
+    for code in range(0xC0, 0x250):
+        base = unicodedata.normalize("NFD", chr(code))[0].lower()
+        if code not in table and base in weights:
+            table[code] = weights[base]
+
+    return table
+
+
+_TABLE = _build_table()
+
+
+def collation_key(text: str) -> Tuple[str, str]:
+    """
+    Build the Turkish collation key of a text.
+
+    Args:
+        text: Text to build the key for
+
+    Returns:
+        Sort key; texts that only differ in case or accents are ordered by
+        their original form
+    """
+    return text.translate(_TABLE), text
@@ -0,0 +1,173 @@
+"""
+HTTP content codings for compressed responses.
+
+gzip is always available; Brotli ("br") and Zstandard ("zstd") are used when
+their optional compressors (brotli, zstandard) are installed. Codings are
+negotiated from the Accept-Encoding header, preferring the smallest output
+when the client weighs several equally.
+"""
+
+import gzip
+import zlib
+from typing import Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, only needed for Brotli responses
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for Zstandard responses
+    zstandard = None
+
+# Content codings in order of preference (smallest output first)
+CODINGS = ("br", "zstd", "gzip")
+
+# The uncompressed representation
+IDENTITY = "identity"
+
+
+def is_available(coding: str) -> bool:
+    """
+    Check whether a content coding can be produced.
+
+    Args:
+        coding: Coding name, one of CODINGS or IDENTITY
+
+    Returns:
+        True if the coding's compressor is installed
+    """
+    if coding == "br":
+        return brotli is not None
+    if coding == "zstd":
+        return zstandard is not None
+    return coding in ("gzip", IDENTITY)
+
+
+def available_codings() -> tuple:
+    """
+    Get the content codings that can be produced.
+
+    Returns:
+        Coding names in order of preference
+    """
+    return tuple(coding for coding in CODINGS if is_available(coding))
+
+
+def compress(body: bytes, coding: str, level: int) -> bytes:
+    """
+    Compress a response body.
+
+    Args:
+        body: Uncompressed body
+        coding: Coding name, one of CODINGS (its compressor must be installed)
+        level: Compression level of the coding (gzip 1-9, br 0-11, zstd 1-22)
+
+    Returns:
+        Compressed body
+    """
+    if coding == "br":
+        return brotli.compress(body, quality=level)
+    if coding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    # mtime=0 keeps the output, and so the ETag of pre-compressed bodies, stable across restarts
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class StreamCompressor:
+    """
+    Incremental compressor for bodies sent in chunks.
+
+    Every chunk is flushed, so the client can decode what it has received so
+    far while the rest of the body is still being produced.
+    """
+
+    def __init__(self, coding: str, level: int):
+        """
+        Start a compressed stream.
+
+        Args:
+            coding: Coding name, one of CODINGS (its compressor must be installed)
+            level: Compression level of the coding
+        """
+        self.coding = coding
+        if coding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        elif coding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        Compress and flush a chunk of the body.
+
+        Args:
+            chunk: Uncompressed chunk
+
+        Returns:
+            Compressed data for the chunk
+        """
+        if self.coding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        if self.coding == "zstd":
+            return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """
+        End the stream.
+
+        Returns:
+            Remaining compressed data
+        """
+        if self.coding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def negotiate_coding(accept_encoding: Optional[str], codings: Iterable[str]) -> Optional[str]:
+    """
+    Pick the content coding for an Accept-Encoding header.
+
+    Codings are tried by decreasing quality, then in the order given; "*"
+    stands for every coding the header does not name. The uncompressed
+    representation is acceptable unless the header excludes it.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+        codings: Codings that can be produced, in order of preference
+
+    Returns:
+        Coding name, IDENTITY, or None if no acceptable representation can be produced
+    """
+    qualities = {}
+    for entry in (accept_encoding or "").split(","):
+        name, *params = entry.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    wildcard = qualities.get("*")
+    codings = tuple(codings)
+    candidates = []
+    for index, coding in enumerate(codings):
+        quality = qualities.get(coding, wildcard)
+        if quality:
+            candidates.append((-quality, index, coding))
+
+    # Identity ranks after every coding of the same quality
+    identity = qualities.get(IDENTITY, 1.0 if wildcard is None else wildcard)
+    if identity:
+        candidates.append((-identity, len(codings), IDENTITY))
+    return min(candidates)[2] if candidates else None
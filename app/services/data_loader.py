@@ -1,13 +1,53 @@
 import json
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from app.config import COMPOSITE_SORT_CACHE_SIZE
+from app.services.collation import COLLATED_FIELDS, collation_key
+from app.services.encoding import encode
+from app.services.frozen import FrozenDict, FrozenList, freeze
+from app.services.indexes import BitmapIndex, RangeIndex, SortOrder, value_ranks
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional dependency, only needed for Arrow and Parquet exports
+    pa = None
+
+# Parent entity and the foreign key pointing at it, per entity type
+PARENTS = {
+    "districts": ("provinces", "provinceId"),
+    "neighborhoods": ("districts", "districtId"),
+    "villages": ("districts", "districtId"),
+    "towns": ("districts", "districtId"),
+}
+
+# Level names used in ancestry summaries
+LEVELS = {
+    "provinces": "province",
+    "districts": "district",
+    "neighborhoods": "neighborhood",
+    "villages": "village",
+    "towns": "town",
+}
+
+# Record fields repeating the names of a record's ancestors, and the id field naming the same ancestor
+PARENT_NAME_FIELDS = {
+    "districts": {"province": "provinceId"},
+    "neighborhoods": {"province": "provinceId", "district": "districtId"},
+    "villages": {"province": "provinceId", "district": "districtId"},
+    "towns": {"province": "provinceId", "district": "districtId"},
+}
 
 
 class DataLoader:
     _instance = None
     _data_cache = {}
+    _index_cache = {}
+    _composite_sort_cache = OrderedDict()
+    _composite_sort_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
@@ -21,7 +61,8 @@ class DataLoader:
         if filename not in self._data_cache:
             file_path = self.data_dir / filename
             with open(file_path, "r", encoding="utf-8") as f:
-                self._data_cache[filename] = json.load(f)
+                # Shared by every request, so frozen
+                self._data_cache[filename] = freeze(json.load(f))
         return self._data_cache[filename]
 
     @property
@@ -44,6 +85,239 @@ class DataLoader:
     def towns(self) -> List[Dict[str, Any]]:
         return self.load_json("towns.min.json")
 
+    def records(self, entity: str) -> List[Dict[str, Any]]:
+        """Get the dataset of an entity type by name."""
+        return getattr(self, entity)
+
+    def view(self, entity: str, postal_codes: bool = True) -> List[Dict[str, Any]]:
+        """Get the list view of an entity in row order (province records carry their district summaries)."""
+        key = ("view", entity, postal_codes)
+        if key not in self._index_cache:
+            records = self.records(entity)
+            if entity == "provinces":
+                districts = self.districts_by_province
+                records = [{**record, "districts": districts.get(record["id"], [])} for record in records]
+            if not postal_codes:
+                records = [{k: v for k, v in record.items() if k != "postalCode"} for record in records]
+            self._index_cache[key] = freeze(records)
+        return self._index_cache[key]
+
+    def detail_view(self, entity: str, postal_codes: bool = True, extend: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get the detail documents of an entity in row order.
+
+        District details carry their neighborhoods and villages, extended province
+        details the neighborhoods and villages of their districts.
+        """
+        if entity == "districts":
+            extend = False
+        elif entity != "provinces":
+            return self.view(entity, postal_codes)
+
+        key = ("detail", entity, postal_codes, extend)
+        if key not in self._index_cache:
+            records = self.view(entity, postal_codes)
+            if entity == "provinces" and extend:
+                districts = self.extended_districts_by_province
+                records = [
+                    FrozenDict(record, districts=districts.get(record["id"], FrozenList())) for record in records
+                ]
+            elif entity == "districts":
+                neighborhoods = self.neighborhoods_by_district
+                villages = self.villages_by_district
+                records = [
+                    FrozenDict(
+                        record,
+                        neighborhoods=neighborhoods.get(record["id"], FrozenList()),
+                        villages=villages.get(record["id"], FrozenList()),
+                    )
+                    for record in records
+                ]
+            self._index_cache[key] = FrozenList(records)
+        return self._index_cache[key]
+
+    def detail_documents(
+        self, entity: str, postal_codes: bool = True, extend: bool = False, format: str = "json"
+    ) -> List[bytes]:
+        """Get the encoded detail documents of an entity in row order."""
+        key = ("document", entity, postal_codes, extend and entity == "provinces", format)
+        if key not in self._index_cache:
+            self._index_cache[key] = FrozenList(
+                encode(record, format) for record in self.detail_view(entity, postal_codes, extend)
+            )
+        return self._index_cache[key]
+
+    def fragments(
+        self, entity: str, postal_codes: bool = True, format: str = "json", normalized: bool = False
+    ) -> List[bytes]:
+        """Get the encoded list view records of an entity in row order, for list responses to join."""
+        key = ("fragment", entity, postal_codes, format, normalized and entity in PARENT_NAME_FIELDS)
+        if key not in self._index_cache:
+            if key[-1]:
+                names = PARENT_NAME_FIELDS[entity]
+                fragments = FrozenList(
+                    encode({k: v for k, v in record.items() if k not in names}, format)
+                    for record in self.view(entity, postal_codes)
+                )
+            elif not postal_codes and not any("postalCode" in record for record in self.records(entity)):
+                # Nothing to strip, so both variants share the same fragments
+                fragments = self.fragments(entity, True, format)
+            elif entity == "districts":
+                fragments = FrozenList(encode(record, format) for record in self.view(entity, postal_codes))
+            else:
+                # Apart from districts, a detail document is the list view record itself
+                fragments = self.detail_documents(entity, postal_codes, format=format)
+            self._index_cache[key] = fragments
+        return self._index_cache[key]
+
+    def materialize_detail_documents(self) -> int:
+        """Encode every province and district detail document, returning how many there are."""
+        count = 0
+        for postal_codes in (False, True):
+            for extend in (False, True):
+                count += len(self.detail_documents("provinces", postal_codes, extend))
+            count += len(self.detail_documents("districts", postal_codes))
+        return count
+
+    def materialize_fragments(self) -> int:
+        """Encode the list view records of every entity, returning how many there are."""
+        count = 0
+        for entity in ("provinces", "districts", "neighborhoods", "villages", "towns"):
+            for postal_codes in (False, True):
+                count += len(self.fragments(entity, postal_codes))
+        return count
+
+    def columns(self, entity: str, postal_codes: bool = True) -> Dict[str, List[Any]]:
+        """Get the list view of an entity as its columns (None where a record lacks the field)."""
+        key = ("columns", entity, postal_codes)
+        if key not in self._index_cache:
+            records = self.view(entity, postal_codes)
+            fields = dict.fromkeys(field for record in records for field in record)
+            self._index_cache[key] = FrozenDict(
+                (field, FrozenList(record.get(field) for record in records)) for field in fields
+            )
+        return self._index_cache[key]
+
+    def arrow_table(self, entity: str, postal_codes: bool = True) -> "pa.Table":
+        """Get the list view of an entity as an Arrow table (requires pyarrow)."""
+        key = ("arrow", entity, postal_codes)
+        if key not in self._index_cache:
+            columns = self.columns(entity, postal_codes)
+            self._index_cache[key] = pa.table({field: pa.array(values) for field, values in columns.items()})
+        return self._index_cache[key]
+
+    def summaries(self, entity: str) -> List[Dict[str, Any]]:
+        """Get the {level, id, name} summaries of an entity in row order."""
+        key = ("summary", entity)
+        if key not in self._index_cache:
+            level = LEVELS[entity]
+            self._index_cache[key] = FrozenList(
+                FrozenDict(level=level, id=record["id"], name=record["name"]) for record in self.records(entity)
+            )
+        return self._index_cache[key]
+
+    def parent_positions(self, entity: str) -> List[Any]:
+        """Get the row position of every record's parent (None if it does not exist)."""
+        key = ("parent", entity)
+        if key not in self._index_cache:
+            parent, foreign_key = PARENTS[entity]
+            index = self.id_index(parent)
+            self._index_cache[key] = FrozenList(index.get(record[foreign_key]) for record in self.records(entity))
+        return self._index_cache[key]
+
+    def parent_names(self, entity: str, positions: Iterable[int]) -> Dict[str, Dict[str, str]]:
+        """Map the ancestor ids of some rows to their names, per ancestor entity from the top level down."""
+        names = {}
+        rows = positions
+        while entity in PARENTS:
+            parent, _ = PARENTS[entity]
+            rows = sorted(set(map(self.parent_positions(entity).__getitem__, rows)).difference([None]))
+            records = self.records(parent)
+            names[parent] = {str(records[row]["id"]): records[row]["name"] for row in rows}
+            entity = parent
+        return dict(reversed(names.items()))
+
+    def children_index(self, entity: str, foreign_key: str) -> Dict[int, List[int]]:
+        """Map every parent id to the row positions of its children."""
+        key = ("children", entity, foreign_key)
+        if key not in self._index_cache:
+            children: Dict[int, List[int]] = {}
+            for position, record in enumerate(self.records(entity)):
+                children.setdefault(record[foreign_key], []).append(position)
+            self._index_cache[key] = FrozenDict((parent_id, FrozenList(rows)) for parent_id, rows in children.items())
+        return self._index_cache[key]
+
+    def ancestry(self, entity: str, position: int) -> List[Dict[str, Any]]:
+        """Get the summaries from the province down to a record."""
+        chain = [self.summaries(entity)[position]]
+        while entity in PARENTS and position is not None:
+            position = self.parent_positions(entity)[position]
+            entity = PARENTS[entity][0]
+            if position is not None:
+                chain.append(self.summaries(entity)[position])
+        chain.reverse()
+        return chain
+
+    def id_index(self, entity: str) -> Dict[int, int]:
+        """Map every record id to its row position."""
+        key = ("id", entity)
+        if key not in self._index_cache:
+            self._index_cache[key] = FrozenDict(
+                (record["id"], position) for position, record in enumerate(self.records(entity))
+            )
+        return self._index_cache[key]
+
+    def range_index(self, entity: str, field: str) -> RangeIndex:
+        """Get the range index of a numeric field."""
+        key = ("range", entity, field)
+        if key not in self._index_cache:
+            self._index_cache[key] = RangeIndex(self.records(entity), field)
+        return self._index_cache[key]
+
+    def bitmap_index(self, entity: str, field: str) -> BitmapIndex:
+        """Get the bitmap index of a categorical or foreign-key field."""
+        key = ("bitmap", entity, field)
+        if key not in self._index_cache:
+            self._index_cache[key] = BitmapIndex(self.records(entity), field)
+        return self._index_cache[key]
+
+    def value_ranks(self, entity: str, field: str) -> List[int]:
+        """Get the rank of every row by a field (name fields by Turkish collation)."""
+        key = ("rank", entity, field)
+        if key not in self._index_cache:
+            sort_key = collation_key if field in COLLATED_FIELDS else None
+            self._index_cache[key] = FrozenList(value_ranks(self.view(entity), field, sort_key))
+        return self._index_cache[key]
+
+    def sort_order(self, entity: str, keys: Sequence[Tuple[str, bool]]) -> SortOrder:
+        """
+        Get the ordering of an entity by (field, descending) keys.
+
+        Single-field orders are kept for good, composite ones in a small LRU cache.
+        """
+        keys = tuple(keys)
+        key = ("sort", entity, keys)
+        if len(keys) == 1:
+            if key not in self._index_cache:
+                self._index_cache[key] = SortOrder([(self.value_ranks(entity, keys[0][0]), keys[0][1])])
+            return self._index_cache[key]
+
+        # The LRU is shared by the event loop and executor threads, so every change to it holds the lock
+        with self._composite_sort_lock:
+            order = self._composite_sort_cache.get(key)
+            if order is not None:
+                self._composite_sort_cache.move_to_end(key)
+                return order
+
+        # Built outside the lock; threads racing on the same order just build it twice
+        order = SortOrder([(self.value_ranks(entity, field), descending) for field, descending in keys])
+        with self._composite_sort_lock:
+            self._composite_sort_cache[key] = order
+            self._composite_sort_cache.move_to_end(key)
+            while len(self._composite_sort_cache) > COMPOSITE_SORT_CACHE_SIZE:
+                self._composite_sort_cache.popitem(last=False)
+        return order
+
     @property
     @lru_cache(maxsize=1)
     def districts_by_province(self) -> Dict[int, List[Dict[str, Any]]]:
@@ -63,7 +337,7 @@ class DataLoader:
                     "area": district["area"],
                 }
             )
-        return dict(index)
+        return freeze(dict(index))
 
     @property
     @lru_cache(maxsize=1)
@@ -79,7 +353,7 @@ class DataLoader:
             index[neighborhood["districtId"]].append(
                 {"id": neighborhood["id"], "name": neighborhood["name"], "population": neighborhood["population"]}
             )
-        return dict(index)
+        return freeze(dict(index))
 
     @property
     @lru_cache(maxsize=1)
@@ -95,7 +369,33 @@ class DataLoader:
             index[village["districtId"]].append(
                 {"id": village["id"], "name": village["name"], "population": village["population"]}
             )
-        return dict(index)
+        return freeze(dict(index))
+
+    @property
+    @lru_cache(maxsize=1)
+    def extended_districts_by_province(self) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Index district summaries with their neighborhoods and villages by province_id.
+
+        Returns:
+            Dictionary mapping province_id to list of extended district summaries
+        """
+        neighborhoods = self.neighborhoods_by_district
+        villages = self.villages_by_district
+        return FrozenDict(
+            (
+                province_id,
+                FrozenList(
+                    FrozenDict(
+                        district,
+                        neighborhoods=neighborhoods.get(district["id"], FrozenList()),
+                        villages=villages.get(district["id"], FrozenList()),
+                    )
+                    for district in districts
+                ),
+            )
+            for province_id, districts in self.districts_by_province.items()
+        )
 
 
 data_loader = DataLoader()
@@ -1,10 +1,8 @@
 import logging
-from typing import Any, Dict, List, Optional
-
-from fastapi import HTTPException
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import DEFAULT_MAX_AREA, DEFAULT_MAX_POPULATION, DEFAULT_MIN_AREA, DEFAULT_MIN_POPULATION
-from app.services.base_service import BaseService
+from app.services.base_service import BaseService, Page
 
 logger = logging.getLogger(__name__)
 
@@ -30,86 +28,259 @@ class DistrictService(BaseService):
         limit: int = 1000,
         fields: Optional[str] = None,
         sort: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        # Get districts (no .copy() needed - filtering creates new list)
-        districts = self.data_loader.districts
-
-        # Remove postal codes if not activated
-        if not activate_postal_codes:
-            districts = [{k: v for k, v in d.items() if k != "postalCode"} for d in districts]
-        else:
-            # Create shallow copy to avoid modifying original
-            districts = [d.copy() for d in districts]
-
-        if name:
-            name_alt = name.capitalize()
-            districts = [d for d in districts if name in d["name"] or name_alt in d["name"]]
-
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        ranges = {}
         if min_population is not None or max_population is not None:
             min_pop = min_population if min_population is not None else DEFAULT_MIN_POPULATION
             max_pop = max_population if max_population is not None else DEFAULT_MAX_POPULATION
-            districts = [d for d in districts if min_pop <= d["population"] <= max_pop]
+            ranges["population"] = (min_pop, max_pop)
 
         if min_area is not None or max_area is not None:
             min_a = min_area if min_area is not None else DEFAULT_MIN_AREA
             max_a = max_area if max_area is not None else DEFAULT_MAX_AREA
-            districts = [d for d in districts if min_a <= d["area"] <= max_a]
+            ranges["area"] = (min_a, max_a)
+
+        # Indexed filters are combined as row bitmaps; the rest run on the shared view
+        rows = self._select_rows("districts", ranges=ranges, equals={"provinceId": province_id})
 
-        if province_id is not None:
-            districts = [d for d in districts if d["provinceId"] == province_id]
+        filters = []
+        if name:
+            filters.append(self._text_filter("name", name))
 
         if province:
-            province_alt = province.capitalize()
-            districts = [d for d in districts if province in d["province"] or province_alt in d["province"]]
+            filters.append(self._text_filter("province", province))
 
         if postal_code:
-            districts = [d for d in districts if d.get("postalCode") and postal_code in d["postalCode"]]
+            filters.append(lambda d: bool(d.get("postalCode")) and postal_code in d["postalCode"])
 
-        if not districts:
-            raise HTTPException(status_code=404, detail="Districts not found.")
+        if count_only:
+            return Page(total=self._count_rows("districts", rows, filters, postal_codes=activate_postal_codes))
 
-        districts = self._sort_data(districts, sort)
+        return self._query_records(
+            "districts",
+            rows,
+            filters,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            not_found="Districts not found.",
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+            postal_codes=activate_postal_codes,
+        )
 
-        len(districts)
-        districts = districts[offset : offset + limit]
+    def get_exact_district(
+        self, district_id: int, fields: Optional[str] = None, activate_postal_codes: bool = False
+    ) -> Dict[str, Any]:
+        district = self._get_record("districts", district_id, "District not found.", postal_codes=activate_postal_codes)
 
         if fields:
-            districts = [self._filter_fields(d, fields) for d in districts]
+            district = self._filter_fields(district, fields)
 
-        return districts
+        return district
 
-    def get_exact_district(
-        self, district_id: int, fields: Optional[str] = None, activate_postal_codes: bool = False
-    ) -> Dict[str, Any]:
-        districts = self.data_loader.districts
-        district = next((d for d in districts if d["id"] == district_id), None)
+    def get_exact_district_document(
+        self, district_id: int, activate_postal_codes: bool = False, format: str = "json"
+    ) -> bytes:
+        """
+        Get the pre-serialized detail document of a district.
 
-        if not district:
-            raise HTTPException(status_code=404, detail="District not found.")
+        Args:
+            district_id: District ID
+            activate_postal_codes: Whether to include postal codes
+            format: Encoding, one of encoding.MEDIA_TYPES
 
-        district = district.copy()
+        Returns:
+            Encoded document
 
-        if not activate_postal_codes and "postalCode" in district:
-            del district["postalCode"]
+        Raises:
+            HTTPException: If the district does not exist
+        """
+        return self._get_document(
+            "districts", district_id, "District not found.", postal_codes=activate_postal_codes, format=format
+        )
 
-        district_neighborhoods = [
-            {"id": n["id"], "name": n["name"], "population": n["population"]}
-            for n in self.data_loader.neighborhoods
-            if n["districtId"] == district["id"]
-        ]
-        district["neighborhoods"] = district_neighborhoods
+    def get_districts_by_ids(
+        self, ids: List[int], fields: Optional[str] = None, activate_postal_codes: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get many districts by id in one call.
 
-        district_villages = [
-            {"id": v["id"], "name": v["name"], "population": v["population"]}
-            for v in self.data_loader.villages
-            if v["districtId"] == district["id"]
-        ]
-        district["villages"] = district_villages
+        Args:
+            ids: District IDs, in the order the results should be returned
+            fields: Comma-separated list of fields to return
+            activate_postal_codes: Whether to include postal codes
 
-        if fields:
-            district = self._filter_fields(district, fields)
+        Returns:
+            Tuple of (districts as listed by get_districts, in input order; ids that do not exist)
+        """
+        return self._get_records_by_ids("districts", ids, fields=fields, postal_codes=activate_postal_codes)
 
-        return district
+    def get_district_ancestry(self, district_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the breadcrumb chain of a district.
+
+        Args:
+            district_id: District ID
+
+        Returns:
+            {level, id, name} summaries from the province down to the district
+
+        Raises:
+            HTTPException: If the district does not exist
+        """
+        return self._get_ancestry("districts", district_id, "District not found.")
+
+    def get_districts_ancestries(self, ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get the breadcrumb chains of many districts in one call.
+
+        Args:
+            ids: District IDs, in the order the results should be returned
+
+        Returns:
+            Tuple of ({id, ancestry} items in input order, ids that do not exist)
+        """
+        return self._get_ancestries("districts", ids)
+
+    def get_district_neighborhoods(
+        self,
+        district_id: int,
+        offset: int = 0,
+        limit: int = 1000,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        """
+        List the neighborhoods of a district from the hierarchy index.
+
+        Args:
+            district_id: District ID
+            offset: Starting position in the result set
+            limit: Maximum number of neighborhoods to return
+            fields: Comma-separated list of fields to return
+            sort: Sort specification
+            cursor: Cursor of the next page
+            with_total: Whether cursor pages should also carry the total
+            count_only: Whether to return only the number of neighborhoods
+
+        Returns:
+            Page of neighborhoods (empty if the district has none)
+
+        Raises:
+            HTTPException: If the district does not exist
+        """
+        return self._get_children(
+            "districts",
+            district_id,
+            "District not found.",
+            "neighborhoods",
+            "districtId",
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+            count_only=count_only,
+        )
+
+    def get_district_villages(
+        self,
+        district_id: int,
+        offset: int = 0,
+        limit: int = 1000,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        """
+        List the villages of a district from the hierarchy index.
+
+        Args:
+            district_id: District ID
+            offset: Starting position in the result set
+            limit: Maximum number of villages to return
+            fields: Comma-separated list of fields to return
+            sort: Sort specification
+            cursor: Cursor of the next page
+            with_total: Whether cursor pages should also carry the total
+            count_only: Whether to return only the number of villages
+
+        Returns:
+            Page of villages (empty if the district has none)
+
+        Raises:
+            HTTPException: If the district does not exist
+        """
+        return self._get_children(
+            "districts",
+            district_id,
+            "District not found.",
+            "villages",
+            "districtId",
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+            count_only=count_only,
+        )
+
+    def get_district_towns(
+        self,
+        district_id: int,
+        offset: int = 0,
+        limit: int = 1000,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        """
+        List the towns of a district from the hierarchy index.
+
+        Args:
+            district_id: District ID
+            offset: Starting position in the result set
+            limit: Maximum number of towns to return
+            fields: Comma-separated list of fields to return
+            sort: Sort specification
+            cursor: Cursor of the next page
+            with_total: Whether cursor pages should also carry the total
+            count_only: Whether to return only the number of towns
+
+        Returns:
+            Page of towns (empty if the district has none)
+
+        Raises:
+            HTTPException: If the district does not exist
+        """
+        return self._get_children(
+            "districts",
+            district_id,
+            "District not found.",
+            "towns",
+            "districtId",
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+            count_only=count_only,
+        )
 
 
 district_service = DistrictService()
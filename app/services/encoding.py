@@ -0,0 +1,190 @@
+"""
+Wire formats for API responses.
+
+JSON is always available; MessagePack and CBOR are used when their optional
+encoders (msgpack, cbor2) are installed. All three can be assembled from
+pre-encoded parts: an array is an opening bracket or length header followed by
+its items, a map likewise for its keys and values. This lets list responses
+splice the pre-encoded records kept by DataLoader in any format.
+"""
+
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, only needed for MessagePack responses
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # Optional dependency, only needed for CBOR responses
+    cbor2 = None
+
+# Media type of every response format
+MEDIA_TYPES = {"json": "application/json", "msgpack": "application/msgpack", "cbor": "application/cbor"}
+
+# Accept header media ranges understood by negotiate()
+_ACCEPTED = {
+    "application/json": "json",
+    "application/*": "json",
+    "*/*": "json",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/cbor": "cbor",
+}
+
+
+def is_available(format: str) -> bool:
+    """
+    Check whether a response format can be produced.
+
+    Args:
+        format: Format name, one of MEDIA_TYPES
+
+    Returns:
+        True if the format's encoder is installed
+    """
+    if format == "msgpack":
+        return msgpack is not None
+    if format == "cbor":
+        return cbor2 is not None
+    return format == "json"
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick the response format for an Accept header.
+
+    Media ranges are tried by decreasing quality; JSON is the default when the
+    header is missing or names nothing this API produces.
+
+    Args:
+        accept: Accept header value
+
+    Returns:
+        Format name, or None if the only acceptable formats are binary ones
+        whose encoders are not installed
+    """
+    if not accept:
+        return "json"
+
+    ranges = []
+    for index, media_range in enumerate(accept.split(",")):
+        media_type, *params = media_range.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((-quality, index, media_type.strip().lower()))
+
+    unavailable = False
+    for negative_quality, _, media_type in sorted(ranges):
+        format = _ACCEPTED.get(media_type)
+        if format is None or not negative_quality:
+            continue
+        if is_available(format):
+            return format
+        unavailable = True
+    return None if unavailable else "json"
+
+
+def encode(value: Any, format: str = "json") -> bytes:
+    """
+    Encode a JSON-native value.
+
+    Args:
+        value: Value to encode
+        format: Format name, one of MEDIA_TYPES (its encoder must be installed)
+
+    Returns:
+        Encoded value
+    """
+    if format == "msgpack":
+        return msgpack.packb(value)
+    if format == "cbor":
+        return cbor2.dumps(value)
+    return orjson.dumps(value)
+
+
+def envelope_parts(
+    envelope: Dict[str, Any], data: Iterable[List[bytes]], length: int, format: str = "json"
+) -> Iterator[bytes]:
+    """
+    Encode a response envelope whose "data" array is made of pre-encoded items.
+
+    Args:
+        envelope: Envelope fields in output order; the value of "data" is ignored
+        data: Batches of encoded "data" items
+        length: Total number of "data" items
+        format: Format name, one of MEDIA_TYPES
+
+    Returns:
+        Iterator of encoded parts, one per batch plus the surrounding fields
+    """
+    is_json = format == "json"
+    separator = b"," if is_json else b""
+
+    yield b"{" if is_json else _header(len(envelope), format, mapping=True)
+    for index, (key, value) in enumerate(envelope.items()):
+        prefix = (separator if index else b"") + encode(key, format) + (b":" if is_json else b"")
+        if key != "data":
+            yield prefix + encode(value, format)
+            continue
+
+        yield prefix + (b"[" if is_json else _header(length, format, mapping=False))
+        for count, batch in enumerate(data):
+            yield (separator if count else b"") + separator.join(batch)
+        if is_json:
+            yield b"]"
+    if is_json:
+        yield b"}"
+
+
+def document_envelope(document: bytes, format: str = "json") -> bytes:
+    """
+    Wrap a pre-encoded document in the ``{"status": "OK", "data": ...}`` envelope.
+
+    Args:
+        document: Document encoded in the given format
+        format: Format name, one of MEDIA_TYPES
+
+    Returns:
+        Encoded envelope
+    """
+    if format == "json":
+        return b'{"status":"OK","data":' + document + b"}"
+    return (
+        _header(2, format, mapping=True)
+        + encode("status", format)
+        + encode("OK", format)
+        + encode("data", format)
+        + document
+    )
+
+
+def _header(length: int, format: str, mapping: bool) -> bytes:
+    # Length-prefixed array or map header of the binary formats
+    if format == "msgpack":
+        fixed, sized = (0x80, 0xDE) if mapping else (0x90, 0xDC)
+        if length < 16:
+            return bytes([fixed | length])
+        if length < 0x10000:
+            return bytes([sized]) + struct.pack(">H", length)
+        return bytes([sized + 1]) + struct.pack(">I", length)
+
+    major = (5 if mapping else 4) << 5
+    if length < 24:
+        return bytes([major | length])
+    if length < 0x100:
+        return bytes([major | 24, length])
+    if length < 0x10000:
+        return bytes([major | 25]) + struct.pack(">H", length)
+    return bytes([major | 26]) + struct.pack(">I", length)
@@ -0,0 +1,300 @@
+"""
+Streaming bulk exports.
+
+The province -> district -> neighborhood/village/town tree is generated one
+district at a time from the hierarchy indexes, and flat entity exports
+(NDJSON, CSV, Parquet, Arrow IPC) are encoded a slice of rows at a time.
+Output is flushed in chunks of about EXPORT_CHUNK_BYTES as the client reads
+it, so no full JSON string is built for large pulls.
+"""
+
+import csv
+import io
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import orjson
+from fastapi import HTTPException
+
+from app.config import EXPORT_ARROW_BATCH_SIZE, EXPORT_CHUNK_BYTES, EXPORT_PARQUET_ROW_GROUP_SIZE
+from app.services.base_service import BaseService, Page
+from app.services.projection import FieldProjection, compile_fields
+from app.services.query_service import query_service
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for Parquet and Arrow exports
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# Media type of each tree export format
+TREE_MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+# Media type of each flat entity export format
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Export formats written from Arrow tables
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Number of records encoded at a time by the NDJSON and CSV writers
+EXPORT_BATCH_SIZE = 500
+
+# Child entities nested under every district
+DISTRICT_CHILDREN = ("neighborhoods", "villages", "towns")
+
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value)
+
+
+class ExportService(BaseService):
+    """Service generating bulk exports of the datasets."""
+
+    def __init__(self):
+        super().__init__()
+
+    def tree(self, format: str = "json", postal_codes: bool = False) -> Iterator[bytes]:
+        """
+        Stream the complete hierarchy as nested records.
+
+        With "json" the provinces are returned in the usual response envelope;
+        with "ndjson" every province tree is written on its own line.
+
+        Args:
+            format: Output format, one of TREE_MEDIA_TYPES
+            postal_codes: Whether to include postal codes
+
+        Returns:
+            Iterator of encoded chunks
+
+        Raises:
+            HTTPException: If the format is not supported
+        """
+        if format not in TREE_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported export format '{format}'. Use one of: {', '.join(TREE_MEDIA_TYPES)}",
+            )
+        return self._chunked(self._tree_parts(format, postal_codes))
+
+    def entity(self, entity: str, format: str, params: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Stream every record of an entity that matches the list endpoint's filters.
+
+        The query is run before the first chunk is produced, so invalid
+        parameters and empty results fail with the same errors as the list endpoint.
+
+        Args:
+            entity: Entity type name
+            format: Output format, one of EXPORT_MEDIA_TYPES
+            params: List endpoint query parameters (camelCase); offset, limit,
+                meta and countOnly do not apply
+
+        Returns:
+            Iterator of encoded chunks
+
+        Raises:
+            HTTPException: If the format is not supported or not installed, or the query is invalid
+        """
+        if format not in EXPORT_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported export format '{format}'. Use one of: {', '.join(EXPORT_MEDIA_TYPES)}",
+            )
+        if format in COLUMNAR_FORMATS and pa is None:
+            raise HTTPException(
+                status_code=501,
+                detail=f"{format.capitalize()} export requires pyarrow (pip install turkiye-api-py[export])",
+            )
+
+        params = dict(params)
+        fields = params.pop("fields", None)
+        records = query_service.select(entity, params)
+        projection = compile_fields(fields) if fields else None
+
+        if format == "ndjson":
+            return self._chunked(self._ndjson_parts(records, projection))
+        if format == "csv":
+            return self._chunked(self._csv_parts(records, projection))
+
+        table = self._arrow_table(records, projection)
+        if format == "parquet":
+            return self._parquet_parts(table)
+        return self._arrow_parts(table)
+
+    @staticmethod
+    def _batches(
+        records: List[Dict[str, Any]], projection: Optional[FieldProjection]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        for start in range(0, len(records), EXPORT_BATCH_SIZE):
+            batch = records[start : start + EXPORT_BATCH_SIZE]
+            yield projection.page(batch) if projection else batch
+
+    def _ndjson_parts(self, records: List[Dict[str, Any]], projection: Optional[FieldProjection]) -> Iterator[bytes]:
+        for batch in self._batches(records, projection):
+            yield b"".join(_dumps(record) + b"\n" for record in batch)
+
+    def _csv_parts(self, records: List[Dict[str, Any]], projection: Optional[FieldProjection]) -> Iterator[bytes]:
+        # Columns follow the first record; nested values are written as JSON
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        columns = None
+        for batch in self._batches(records, projection):
+            if columns is None:
+                columns = list(batch[0])
+                writer.writerow(columns)
+            for record in batch:
+                writer.writerow([_csv_value(record.get(column)) for column in columns])
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    def _arrow_table(self, records: Page, projection: Optional[FieldProjection]) -> "pa.Table":
+        """
+        Convert the selected records to an Arrow table.
+
+        Pages of whole records gather their rows from the entity's cached Arrow
+        table (as is when every row is selected in row order); selected
+        top-level fields are taken from it as well. Only nested selections and
+        pages without row positions are converted from the records.
+        """
+        if records.source is None:
+            table = None
+        else:
+            entity, postal_codes, positions = records.source
+            table = self.data_loader.arrow_table(entity, postal_codes)
+            if not records.is_whole_view():
+                table = table.take(pa.array(positions, type=pa.int32()))
+
+        if projection is None:
+            if table is not None:
+                return table
+            if not records:
+                return pa.table({})
+            return pa.table(
+                {
+                    column: pa.array((record.get(column) for record in records), size=len(records))
+                    for column in records[0]
+                }
+            )
+
+        # An empty page still gets a column for each selected field
+        columns = {}
+        for column in projection(records[0]) if records else projection.fields:
+            if table is not None and projection.fields[column] is None and column in table.column_names:
+                columns[column] = table.column(column)
+            else:
+                columns[column] = pa.array(projection.column(records, column), size=len(records))
+        return pa.table(columns)
+
+    def _parquet_parts(self, table: "pa.Table") -> Iterator[bytes]:
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, table.schema) as writer:
+            for start in range(0, table.num_rows, EXPORT_PARQUET_ROW_GROUP_SIZE):
+                writer.write_table(table.slice(start, EXPORT_PARQUET_ROW_GROUP_SIZE))
+                yield sink.drain()
+        yield sink.drain()
+
+    def _arrow_parts(self, table: "pa.Table") -> Iterator[bytes]:
+        # Record batches are zero-copy slices of the table's columns
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=EXPORT_ARROW_BATCH_SIZE):
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    def _tree_parts(self, format: str, postal_codes: bool) -> Iterator[bytes]:
+        ndjson = format == "ndjson"
+        if not ndjson:
+            yield b'{"status":"OK","data":['
+
+        for index, province in enumerate(self.data_loader.view("provinces", postal_codes)):
+            if index and not ndjson:
+                yield b","
+            yield from self._province_parts(province, postal_codes)
+            if ndjson:
+                yield b"\n"
+
+        if not ndjson:
+            yield b"]}"
+
+    def _province_parts(self, province: Dict[str, Any], postal_codes: bool) -> Iterator[bytes]:
+        # The view's district summaries are replaced by the full district trees
+        header = _dumps({key: value for key, value in province.items() if key != "districts"})
+        yield header[:-1] + (b',"districts":[' if len(header) > 2 else b'"districts":[')
+
+        districts = self.data_loader.view("districts", postal_codes)
+        positions = self.data_loader.children_index("districts", "provinceId").get(province["id"], [])
+        for index, position in enumerate(positions):
+            if index:
+                yield b","
+            yield _dumps(self._district_tree(districts[position], postal_codes))
+
+        yield b"]}"
+
+    def _district_tree(self, district: Dict[str, Any], postal_codes: bool) -> Dict[str, Any]:
+        tree = dict(district)
+        for entity in DISTRICT_CHILDREN:
+            records = self.data_loader.view(entity, postal_codes)
+            positions = self.data_loader.children_index(entity, "districtId").get(district["id"], [])
+            tree[entity] = [records[position] for position in positions]
+        return tree
+
+    @staticmethod
+    def _chunked(parts: Iterable[bytes]) -> Iterator[bytes]:
+        """Join small encoded parts into chunks of about EXPORT_CHUNK_BYTES."""
+        buffer = bytearray()
+        for part in parts:
+            buffer += part
+            if len(buffer) >= EXPORT_CHUNK_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list, bool)):
+        return orjson.dumps(value).decode("utf-8")
+    return value
+
+
+class _ChunkSink:
+    """Write-only file object collecting what a writer produces until it is drained."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+export_service = ExportService()
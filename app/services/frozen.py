@@ -0,0 +1,65 @@
+"""
+Read-only containers for data shared between requests.
+
+The loaded datasets, their indexes and prebuilt views are shared by every
+request, so they are frozen once at load time instead of being copied per
+request. FrozenDict and FrozenList subclass dict and list, so JSON encoders
+and ``isinstance`` checks keep working; every mutating method raises TypeError.
+"""
+
+from typing import Any, NoReturn
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+
+class FrozenDict(dict):
+    """Dictionary that cannot be modified after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self) -> dict:
+        """Return a mutable shallow copy."""
+        return dict(self)
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class FrozenList(list):
+    """List that cannot be modified after construction."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def copy(self) -> list:
+        """Return a mutable shallow copy."""
+        return list(self)
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert dictionaries and lists to their frozen counterparts.
+
+    Args:
+        value: Value to freeze (already frozen containers are returned as is)
+
+    Returns:
+        Frozen value
+    """
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
@@ -0,0 +1,164 @@
+"""
+In-memory indexes over the loaded datasets.
+
+Indexes address records by their row position in the list returned by
+DataLoader. Filter results are row bitmaps (Python ints, bit N = row N), so
+several indexed filters combine with a bitwise AND before any record is
+touched, and counts and pages can be read straight from the result. Indexes
+are shared by every request, so their arrays and maps are frozen.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.services.frozen import FrozenDict, FrozenList
+
+# Set bit offsets for every byte value, used to walk bitmaps a byte at a time
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bitmap_from_positions(positions: Iterable[int], size: int) -> int:
+    """Build a row bitmap with one bit set per row position."""
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def bitmap_count(bitmap: int) -> int:
+    """Count the rows in a bitmap."""
+    return bin(bitmap).count("1")
+
+
+def bitmap_positions(bitmap: int, offset: int = 0, limit: Optional[int] = None) -> List[int]:
+    """List the row positions in a bitmap in ascending order, paged by offset and limit."""
+    positions: List[int] = []
+    if limit is not None and limit <= 0:
+        return positions
+
+    skip = offset
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        if not byte:
+            continue
+        bits = _BYTE_BITS[byte]
+        if skip >= len(bits):
+            skip -= len(bits)
+            continue
+        base = index << 3
+        positions.extend(base + bit for bit in bits[skip:])
+        skip = 0
+        if limit is not None and len(positions) >= limit:
+            return positions[:limit]
+    return positions
+
+
+class RangeIndex:
+    """Sorted values of a numeric field with their row positions, for inclusive range filters."""
+
+    __slots__ = ("values", "positions", "missing", "size")
+
+    def __init__(self, records: List[Dict[str, Any]], field: str):
+        """Build the index of a field."""
+        pairs = sorted(
+            (record[field], position) for position, record in enumerate(records) if record.get(field) is not None
+        )
+        self.values = FrozenList(value for value, _ in pairs)
+        self.positions = FrozenList(position for _, position in pairs)
+        self.missing = FrozenList(position for position, record in enumerate(records) if record.get(field) is None)
+        self.size = len(records)
+
+    def _bounds(self, min_value: Any, max_value: Any) -> Tuple[int, int]:
+        return bisect_left(self.values, min_value), bisect_right(self.values, max_value)
+
+    def count(self, min_value: Any, max_value: Any) -> int:
+        """Count the rows whose value lies in the inclusive range."""
+        start, end = self._bounds(min_value, max_value)
+        return max(end - start, 0)
+
+    def lookup(self, min_value: Any, max_value: Any) -> List[int]:
+        """List the rows whose value lies in the inclusive range, in dataset order."""
+        start, end = self._bounds(min_value, max_value)
+        return sorted(self.positions[start:end])
+
+    def bitmap(self, min_value: Any, max_value: Any) -> int:
+        """
+        Build the row bitmap of an inclusive range.
+
+        Wide ranges are built from the rows outside them, so the cost never exceeds half the dataset.
+        """
+        start, end = self._bounds(min_value, max_value)
+        if end - start <= self.size // 2:
+            return bitmap_from_positions(self.positions[start:end], self.size)
+
+        outside = self.positions[:start] + self.positions[end:] + self.missing
+        return ((1 << self.size) - 1) & ~bitmap_from_positions(outside, self.size)
+
+
+class BitmapIndex:
+    """Row bitmaps for every distinct value of a categorical or foreign-key field."""
+
+    __slots__ = ("bitmaps",)
+
+    def __init__(self, records: List[Dict[str, Any]], field: str):
+        """Build the index of a field."""
+        groups: Dict[Any, List[int]] = defaultdict(list)
+        for position, record in enumerate(records):
+            groups[record.get(field)].append(position)
+        self.bitmaps = FrozenDict(
+            (value, bitmap_from_positions(positions, len(records))) for value, positions in groups.items()
+        )
+
+    def get(self, value: Any) -> int:
+        """Get the row bitmap of a value (0 if no row holds it)."""
+        return self.bitmaps.get(value, 0)
+
+
+def value_ranks(
+    records: List[Dict[str, Any]], field: str, sort_key: Optional[Callable[[Any], Any]] = None
+) -> List[int]:
+    """
+    Rank every row by the value of a field, equal values sharing a rank.
+
+    Ranks follow BaseService._sort_data (None and missing values last), so
+    comparing ranks compares values. Raises TypeError for incomparable values.
+    """
+    keys = [record.get(field) for record in records]
+    if sort_key is not None:
+        keys = [None if key is None else sort_key(key) for key in keys]
+
+    order = sorted(range(len(keys)), key=lambda position: (keys[position] is None, keys[position]))
+    ranks = [0] * len(keys)
+    rank, previous = -1, object()
+    for position in order:
+        value = keys[position]
+        if rank < 0 or value != previous:
+            rank, previous = rank + 1, value
+        ranks[position] = rank
+    return ranks
+
+
+class SortOrder:
+    """
+    Ordering of a dataset by one or more fields, built from their value ranks.
+
+    Matches BaseService._sort_data (None last, stable for equal keys), so any
+    filtered subset can be ordered by its ranks.
+    """
+
+    __slots__ = ("positions", "ranks")
+
+    def __init__(self, keys: List[Tuple[List[int], bool]]):
+        """Build the ordering from (value ranks, descending) per field, most significant first."""
+        columns = [[-rank for rank in ranks] if descending else ranks for ranks, descending in keys]
+        if len(columns) == 1:
+            sort_key = columns[0].__getitem__
+        else:
+            sort_key = list(zip(*columns)).__getitem__
+        positions = sorted(range(len(columns[0])), key=sort_key)
+        ranks = [0] * len(positions)
+        for rank, position in enumerate(positions):
+            ranks[position] = rank
+        self.positions = FrozenList(positions)
+        self.ranks = FrozenList(ranks)
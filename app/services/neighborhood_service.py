@@ -1,10 +1,8 @@
 import logging
-from typing import Any, Dict, List, Optional
-
-from fastapi import HTTPException
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import DEFAULT_MAX_POPULATION, DEFAULT_MIN_POPULATION
-from app.services.base_service import BaseService
+from app.services.base_service import BaseService, Page
 
 logger = logging.getLogger(__name__)
 
@@ -28,59 +26,94 @@ class NeighborhoodService(BaseService):
         limit: int = 10000,
         fields: Optional[str] = None,
         sort: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        # Get neighborhoods (no .copy() needed - filtering creates new list)
-        neighborhoods = self.data_loader.neighborhoods
-
-        if name:
-            name_alt = name.capitalize()
-            neighborhoods = [n for n in neighborhoods if name in n["name"] or name_alt in n["name"]]
-
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        ranges = {}
         if min_population is not None or max_population is not None:
             min_pop = min_population if min_population is not None else DEFAULT_MIN_POPULATION
             max_pop = max_population if max_population is not None else DEFAULT_MAX_POPULATION
-            neighborhoods = [n for n in neighborhoods if min_pop <= n["population"] <= max_pop]
+            ranges["population"] = (min_pop, max_pop)
 
-        if province_id is not None:
-            neighborhoods = [n for n in neighborhoods if n["provinceId"] == province_id]
+        # Indexed filters are combined as row bitmaps before any record is touched
+        rows = self._select_rows(
+            "neighborhoods", ranges=ranges, equals={"provinceId": province_id, "districtId": district_id}
+        )
 
+        filters = []
+        if name:
+            filters.append(self._text_filter("name", name))
         if province:
-            province_alt = province.capitalize()
-            neighborhoods = [n for n in neighborhoods if province in n["province"] or province_alt in n["province"]]
+            filters.append(self._text_filter("province", province))
+        if district:
+            filters.append(self._text_filter("district", district))
+
+        if count_only:
+            return Page(total=self._count_rows("neighborhoods", rows, filters))
+
+        return self._query_records(
+            "neighborhoods",
+            rows,
+            filters,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            not_found="Neighborhoods not found.",
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+        )
 
-        if district_id is not None:
-            neighborhoods = [n for n in neighborhoods if n["districtId"] == district_id]
+    def get_exact_neighborhood(self, neighborhood_id: int, fields: Optional[str] = None) -> Dict[str, Any]:
+        neighborhood = self._get_record("neighborhoods", neighborhood_id, "Neighborhood not found.")
 
-        if district:
-            district_alt = district.capitalize()
-            neighborhoods = [n for n in neighborhoods if district in n["district"] or district_alt in n["district"]]
+        if fields:
+            neighborhood = self._filter_fields(neighborhood, fields)
 
-        if not neighborhoods:
-            raise HTTPException(status_code=404, detail="Neighborhoods not found.")
+        return neighborhood
 
-        neighborhoods = self._sort_data(neighborhoods, sort)
+    def get_neighborhoods_by_ids(
+        self, ids: List[int], fields: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get many neighborhoods by id in one call.
 
-        len(neighborhoods)
-        neighborhoods = neighborhoods[offset : offset + limit]
+        Args:
+            ids: Neighborhood IDs, in the order the results should be returned
+            fields: Comma-separated list of fields to return
 
-        if fields:
-            neighborhoods = [self._filter_fields(n, fields) for n in neighborhoods]
+        Returns:
+            Tuple of (neighborhoods in input order, ids that do not exist)
+        """
+        return self._get_records_by_ids("neighborhoods", ids, fields=fields)
 
-        return neighborhoods
+    def get_neighborhood_ancestry(self, neighborhood_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the breadcrumb chain of a neighborhood.
 
-    def get_exact_neighborhood(self, neighborhood_id: int, fields: Optional[str] = None) -> Dict[str, Any]:
-        neighborhoods = self.data_loader.neighborhoods
-        neighborhood = next((n for n in neighborhoods if n["id"] == neighborhood_id), None)
+        Args:
+            neighborhood_id: Neighborhood ID
 
-        if not neighborhood:
-            raise HTTPException(status_code=404, detail="Neighborhood not found.")
+        Returns:
+            {level, id, name} summaries from the province down to the neighborhood
 
-        neighborhood = neighborhood.copy()
+        Raises:
+            HTTPException: If the neighborhood does not exist
+        """
+        return self._get_ancestry("neighborhoods", neighborhood_id, "Neighborhood not found.")
 
-        if fields:
-            neighborhood = self._filter_fields(neighborhood, fields)
+    def get_neighborhoods_ancestries(self, ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get the breadcrumb chains of many neighborhoods in one call.
 
-        return neighborhood
+        Args:
+            ids: Neighborhood IDs, in the order the results should be returned
+
+        Returns:
+            Tuple of ({id, ancestry} items in input order, ids that do not exist)
+        """
+        return self._get_ancestries("neighborhoods", ids)
 
 
 neighborhood_service = NeighborhoodService()
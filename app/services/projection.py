@@ -0,0 +1,145 @@
+"""
+Compiled field projection for the ``fields`` query parameter.
+
+A fields specification such as ``"id,name,nuts.nuts1.code,coordinates.latitude"``
+is parsed once into a FieldProjection tree and cached per distinct string, so
+requests only pay for the keys they select. Dotted paths select nested fields;
+when a path goes through a list (e.g. ``districts.name``), every element of the
+list is projected.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+class FieldProjection:
+    """Compiled selection of (possibly nested) fields."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Dict[str, Optional["FieldProjection"]]):
+        """
+        Create a projection.
+
+        Args:
+            fields: Mapping of selected key to the projection of its value
+                (None selects the whole value)
+        """
+        self.fields = fields
+
+    def __call__(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Project a single item.
+
+        Args:
+            item: Dictionary to project
+
+        Returns:
+            New dictionary with only the selected fields
+        """
+        return self._project(item, self._key_order(item))
+
+    def page(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Project a page of records of the same entity.
+
+        The output key order is resolved once from the first record and reused
+        for the rest of the page.
+
+        Args:
+            items: Records to project
+
+        Returns:
+            Projected records
+        """
+        if not items:
+            return []
+        keys = self._key_order(items[0])
+        return [self._project(item, keys) for item in items]
+
+    def column(self, items: Iterable[Dict[str, Any]], key: str) -> Iterator[Any]:
+        """
+        Project one selected field of every item, for column-wise output.
+
+        Args:
+            items: Records to project
+            key: Selected top-level field
+
+        Returns:
+            Iterator of projected values (None where an item lacks the field)
+        """
+        nested = self.fields[key]
+        for item in items:
+            value = item.get(key)
+            if nested is None:
+                yield value
+            elif isinstance(value, dict):
+                yield nested(value)
+            elif isinstance(value, list):
+                yield [nested(element) for element in value if isinstance(element, dict)]
+            else:
+                yield None
+
+    def _key_order(self, item: Dict[str, Any]) -> Tuple[str, ...]:
+        # Keep the record's own key order; selected keys it lacks go last
+        present = tuple(key for key in item if key in self.fields)
+        return present + tuple(key for key in self.fields if key not in item)
+
+    def _project(self, item: Dict[str, Any], keys: Tuple[str, ...]) -> Dict[str, Any]:
+        result = {}
+        for key in keys:
+            if key not in item:
+                continue
+            value = item[key]
+            nested = self.fields[key]
+            if nested is None:
+                result[key] = value
+            elif isinstance(value, dict):
+                result[key] = nested(value)
+            elif isinstance(value, list):
+                result[key] = [nested(element) for element in value if isinstance(element, dict)]
+        return result
+
+
+@lru_cache(maxsize=256)
+def compile_fields(fields: str) -> FieldProjection:
+    """
+    Parse a comma-separated fields specification into a projection.
+
+    Selecting a field whole takes precedence over selecting parts of it
+    (``"nuts,nuts.nuts1"`` selects all of ``nuts``).
+
+    Args:
+        fields: Comma-separated list of field names or dotted paths
+
+    Returns:
+        Compiled (and cached) projection
+
+    Raises:
+        HTTPException: If no field is named or a path has an empty segment (e.g. ``"."``)
+    """
+    # Blank entries (a trailing comma) are skipped, as they always were
+    paths = [path.strip() for path in fields.split(",") if path.strip()]
+    if not paths:
+        raise HTTPException(status_code=400, detail=f"Invalid fields '{fields}'. Name at least one field")
+
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        parts = [part.strip() for part in path.split(".")]
+        if not all(parts):
+            raise HTTPException(status_code=400, detail=f"Invalid field '{path}'. Field paths cannot have empty parts")
+        node = tree
+        for part in parts[:-1]:
+            if node.get(part, {}) is None:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+
+    return _build(tree)
+
+
+def _build(tree: Dict[str, Any]) -> FieldProjection:
+    return FieldProjection({key: None if node is None else _build(node) for key, node in tree.items()})
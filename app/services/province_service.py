@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
 
@@ -11,7 +11,7 @@ from app.config import (
     DEFAULT_MIN_AREA,
     DEFAULT_MIN_POPULATION,
 )
-from app.services.base_service import BaseService
+from app.services.base_service import BaseService, Page
 from app.services.cache_service import cache_service
 
 logger = logging.getLogger(__name__)
@@ -41,7 +41,10 @@ class ProvinceService(BaseService):
         limit: int = 81,
         fields: Optional[str] = None,
         sort: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
         # Try cache first
         cache_key = self.cache.generate_key(
             "provinces",
@@ -60,30 +63,17 @@ class ProvinceService(BaseService):
             limit=limit,
             fields=fields,
             sort=sort,
+            cursor=cursor,
+            with_total=with_total,
+            count_only=count_only,
         )
 
         cached_result = self.cache.get(cache_key)
         if cached_result is not None:
-            logger.debug(f"Returning cached provinces result ({len(cached_result)} items)")
-            return cached_result
+            logger.debug(f"Returning cached provinces result ({len(cached_result['data'])} items)")
+            return Page(cached_result["data"], next_cursor=cached_result["nextCursor"], total=cached_result["total"])
 
-        # Get provinces (no .copy() needed - filtering creates new list)
-        provinces = self.data_loader.provinces
-
-        # Remove postal codes if not activated
-        if not activate_postal_codes:
-            provinces = [{k: v for k, v in p.items() if k != "postalCode"} for p in provinces]
-        else:
-            # Create shallow copy to avoid modifying original
-            provinces = [p.copy() for p in provinces]
-
-        # Add districts using pre-indexed lookups (O(1) instead of O(n*m))
-        for province in provinces:
-            province["districts"] = self.data_loader.districts_by_province.get(province["id"], [])
-
-        if name:
-            name_alt = name.capitalize()
-            provinces = [p for p in provinces if name in p["name"] or name_alt in p["name"]]
+        ranges = {}
 
         if min_population is not None and max_population is not None:
             if min_population <= 0 and max_population <= 0:
@@ -98,7 +88,7 @@ class ProvinceService(BaseService):
         if min_population is not None or max_population is not None:
             min_pop = min_population if min_population is not None else DEFAULT_MIN_POPULATION
             max_pop = max_population if max_population is not None else DEFAULT_MAX_POPULATION
-            provinces = [p for p in provinces if min_pop <= p["population"] <= max_pop]
+            ranges["population"] = (min_pop, max_pop)
 
         if min_area is not None and max_area is not None:
             if min_area <= 0 and max_area <= 0:
@@ -111,67 +101,198 @@ class ProvinceService(BaseService):
         if min_area is not None or max_area is not None:
             min_a = min_area if min_area is not None else DEFAULT_MIN_AREA
             max_a = max_area if max_area is not None else DEFAULT_MAX_AREA
-            provinces = [p for p in provinces if min_a <= p["area"] <= max_a]
+            ranges["area"] = (min_a, max_a)
 
         if min_altitude is not None or max_altitude is not None:
             min_alt = min_altitude if min_altitude is not None else DEFAULT_MIN_ALTITUDE
             max_alt = max_altitude if max_altitude is not None else DEFAULT_MAX_ALTITUDE
-            provinces = [p for p in provinces if min_alt <= p["altitude"] <= max_alt]
+            ranges["altitude"] = (min_alt, max_alt)
 
-        if is_coastal is not None:
-            provinces = [p for p in provinces if p["isCoastal"] == is_coastal]
+        # Indexed filters are combined as row bitmaps; the rest run on the shared view
+        rows = self._select_rows(
+            "provinces", ranges=ranges, equals={"isCoastal": is_coastal, "isMetropolitan": is_metropolitan}
+        )
 
-        if is_metropolitan is not None:
-            provinces = [p for p in provinces if p["isMetropolitan"] == is_metropolitan]
+        filters = []
+        if name:
+            filters.append(self._text_filter("name", name))
 
         if postal_code:
-            provinces = [p for p in provinces if p.get("postalCode") and postal_code in p["postalCode"]]
+            filters.append(lambda p: bool(p.get("postalCode")) and postal_code in p["postalCode"])
 
-        if not provinces:
-            raise HTTPException(status_code=404, detail="Provinces not found.")
+        if count_only:
+            return Page(total=self._count_rows("provinces", rows, filters, postal_codes=activate_postal_codes))
 
-        provinces = self._sort_data(provinces, sort)
-
-        len(provinces)
-        provinces = provinces[offset : offset + limit]
-
-        if fields:
-            provinces = [self._filter_fields(p, fields) for p in provinces]
+        provinces = self._query_records(
+            "provinces",
+            rows,
+            filters,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            not_found="Provinces not found.",
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+            postal_codes=activate_postal_codes,
+        )
 
         # Cache result before returning (TTL: 30 minutes for query results)
-        self.cache.set(cache_key, provinces, ttl=1800)
+        self.cache.set(
+            cache_key,
+            {"data": provinces, "nextCursor": provinces.next_cursor, "total": provinces.total},
+            ttl=1800,
+        )
 
         return provinces
 
     def get_exact_province(
         self, province_id: int, fields: Optional[str] = None, extend: bool = False, activate_postal_codes: bool = False
     ) -> Dict[str, Any]:
-        provinces = self.data_loader.provinces
-        province = next((p for p in provinces if p["id"] == province_id), None)
+        province = self._get_record(
+            "provinces", province_id, "Province not found.", postal_codes=activate_postal_codes, extend=extend
+        )
 
-        if not province:
-            raise HTTPException(status_code=404, detail="Province not found.")
+        if fields:
+            province = self._filter_fields(province, fields)
 
-        # Create shallow copy to avoid modifying original
-        province = province.copy()
+        return province
 
-        if not activate_postal_codes and "postalCode" in province:
-            del province["postalCode"]
+    def get_exact_province_document(
+        self, province_id: int, extend: bool = False, activate_postal_codes: bool = False, format: str = "json"
+    ) -> bytes:
+        """
+        Get the pre-serialized detail document of a province.
+
+        Args:
+            province_id: Province ID / plate number
+            extend: Whether to include district neighborhoods and villages
+            activate_postal_codes: Whether to include postal codes
+            format: Encoding, one of encoding.MEDIA_TYPES
+
+        Returns:
+            Encoded document
+
+        Raises:
+            HTTPException: If the province does not exist
+        """
+        return self._get_document(
+            "provinces",
+            province_id,
+            "Province not found.",
+            postal_codes=activate_postal_codes,
+            extend=extend,
+            format=format,
+        )
 
-        # Use pre-indexed lookup for districts (O(1) instead of O(n))
-        province["districts"] = self.data_loader.districts_by_province.get(province["id"], [])
+    def get_provinces_by_ids(
+        self, ids: List[int], fields: Optional[str] = None, activate_postal_codes: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get many provinces by id in one call.
 
-        # If extend=true, add neighborhoods and villages using pre-indexed lookups
-        if extend:
-            for district in province["districts"]:
-                # O(1) lookup instead of O(n) iteration
-                district["neighborhoods"] = self.data_loader.neighborhoods_by_district.get(district["id"], [])
-                district["villages"] = self.data_loader.villages_by_district.get(district["id"], [])
+        Args:
+            ids: Province IDs, in the order the results should be returned
+            fields: Comma-separated list of fields to return
+            activate_postal_codes: Whether to include postal codes
 
-        if fields:
-            province = self._filter_fields(province, fields)
+        Returns:
+            Tuple of (provinces in input order, ids that do not exist)
+        """
+        return self._get_records_by_ids("provinces", ids, fields=fields, postal_codes=activate_postal_codes)
 
-        return province
+    def get_province_districts(
+        self,
+        province_id: int,
+        offset: int = 0,
+        limit: int = 1000,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+        activate_postal_codes: bool = False,
+    ) -> Page:
+        """
+        List the districts of a province from the hierarchy index.
+
+        Args:
+            province_id: Province ID
+            offset: Starting position in the result set
+            limit: Maximum number of districts to return
+            fields: Comma-separated list of fields to return
+            sort: Sort specification
+            cursor: Cursor of the next page
+            with_total: Whether cursor pages should also carry the total
+            count_only: Whether to return only the number of districts
+            activate_postal_codes: Whether to include postal codes
+
+        Returns:
+            Page of districts (empty if the province has none)
+
+        Raises:
+            HTTPException: If the province does not exist
+        """
+        return self._get_children(
+            "provinces",
+            province_id,
+            "Province not found.",
+            "districts",
+            "provinceId",
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+            count_only=count_only,
+            postal_codes=activate_postal_codes,
+        )
+
+    def get_province_neighborhoods(
+        self,
+        province_id: int,
+        offset: int = 0,
+        limit: int = 1000,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        """
+        List the neighborhoods of a province from the hierarchy index.
+
+        Args:
+            province_id: Province ID
+            offset: Starting position in the result set
+            limit: Maximum number of neighborhoods to return
+            fields: Comma-separated list of fields to return
+            sort: Sort specification
+            cursor: Cursor of the next page
+            with_total: Whether cursor pages should also carry the total
+            count_only: Whether to return only the number of neighborhoods
+
+        Returns:
+            Page of neighborhoods (empty if the province has none)
+
+        Raises:
+            HTTPException: If the province does not exist
+        """
+        return self._get_children(
+            "provinces",
+            province_id,
+            "Province not found.",
+            "neighborhoods",
+            "provinceId",
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+            count_only=count_only,
+        )
 
 
 province_service = ProvinceService()
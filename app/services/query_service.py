@@ -0,0 +1,217 @@
+"""
+Compound queries: several named sub-queries answered in one request.
+
+Each sub-query names a resource, optionally an id, and the same parameters
+the resource's endpoints accept (camelCase, as in the query string). They run
+against the existing services, so indexes, cached projections and sort orders
+are shared, while the HTTP and middleware overhead is paid once.
+"""
+
+import inspect
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import HTTPException
+from pydantic import TypeAdapter, ValidationError
+
+from app.config import (
+    DEFAULT_LIMIT_DISTRICTS,
+    DEFAULT_LIMIT_NEIGHBORHOODS,
+    DEFAULT_LIMIT_PROVINCES,
+    DEFAULT_LIMIT_TOWNS,
+    DEFAULT_LIMIT_VILLAGES,
+    MAX_COMPOUND_QUERIES,
+    MAX_LIMIT_DISTRICTS,
+    MAX_LIMIT_NEIGHBORHOODS,
+    MAX_LIMIT_PROVINCES,
+    MAX_LIMIT_TOWNS,
+    MAX_LIMIT_VILLAGES,
+    MAX_OFFSET,
+)
+from app.models.schemas import SubQuery
+from app.responses import list_envelope
+from app.services.base_service import BaseService, Page
+from app.services.district_service import district_service
+from app.services.neighborhood_service import neighborhood_service
+from app.services.province_service import province_service
+from app.services.town_service import town_service
+from app.services.village_service import village_service
+
+logger = logging.getLogger(__name__)
+
+# Service parameters that are not exposed as query parameters
+_INTERNAL_PARAMETERS = {"self", "offset", "limit", "with_total", "count_only"}
+
+_BOOL = TypeAdapter(bool)
+_INT = TypeAdapter(int)
+
+
+def _camel_case(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+@lru_cache(maxsize=None)
+def _parameters(method: Callable) -> Dict[str, Tuple[str, TypeAdapter]]:
+    """Map the camelCase query parameters of a service method to (argument name, validator)."""
+    parameters = {}
+    for index, (name, parameter) in enumerate(inspect.signature(method).parameters.items()):
+        # The first argument of detail lookups is the id, given separately
+        if name in _INTERNAL_PARAMETERS or (index == 0 and re.fullmatch(r"\w+_id", name)):
+            continue
+        parameters[_camel_case(name)] = (name, TypeAdapter(parameter.annotation))
+    return parameters
+
+
+class QueryService(BaseService):
+    """Service running compound queries against the entity services."""
+
+    def __init__(self):
+        super().__init__()
+        # resource: (list method, detail method, max limit, default limit)
+        self.resources = {
+            "provinces": (
+                province_service.get_provinces,
+                province_service.get_exact_province,
+                MAX_LIMIT_PROVINCES,
+                DEFAULT_LIMIT_PROVINCES,
+            ),
+            "districts": (
+                district_service.get_districts,
+                district_service.get_exact_district,
+                MAX_LIMIT_DISTRICTS,
+                DEFAULT_LIMIT_DISTRICTS,
+            ),
+            "neighborhoods": (
+                neighborhood_service.get_neighborhoods,
+                neighborhood_service.get_exact_neighborhood,
+                MAX_LIMIT_NEIGHBORHOODS,
+                DEFAULT_LIMIT_NEIGHBORHOODS,
+            ),
+            "villages": (
+                village_service.get_villages,
+                village_service.get_exact_village,
+                MAX_LIMIT_VILLAGES,
+                DEFAULT_LIMIT_VILLAGES,
+            ),
+            "towns": (
+                town_service.get_towns,
+                town_service.get_exact_town,
+                MAX_LIMIT_TOWNS,
+                DEFAULT_LIMIT_TOWNS,
+            ),
+        }
+
+    def run(self, queries: Dict[str, SubQuery]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run named sub-queries.
+
+        A failing sub-query does not fail the others; its entry carries the
+        error instead of data.
+
+        Args:
+            queries: Sub-queries by the name their result is returned under
+
+        Returns:
+            Response envelope of every sub-query, keyed by name
+
+        Raises:
+            HTTPException: If more than MAX_COMPOUND_QUERIES sub-queries are given
+        """
+        if len(queries) > MAX_COMPOUND_QUERIES:
+            raise HTTPException(
+                status_code=400, detail=f"At most {MAX_COMPOUND_QUERIES} queries can be combined in one request"
+            )
+
+        results = {}
+        for name, query in queries.items():
+            try:
+                results[name] = self._run_one(query)
+            except HTTPException as e:
+                results[name] = {"status": "ERROR", "error": e.detail}
+            except Exception:
+                logger.exception(f"Unexpected error in compound query '{name}'")
+                results[name] = {"status": "ERROR", "error": "Internal Server Error"}
+        return results
+
+    def _run_one(self, query: SubQuery) -> Dict[str, Any]:
+        list_method, detail_method, max_limit, default_limit = self.resources[query.resource]
+        params = dict(query.params)
+
+        if query.id is not None:
+            kwargs = self._arguments(detail_method, params, query.resource)
+            return {"status": "OK", "data": detail_method(query.id, **kwargs)}
+
+        meta = self._validate(_BOOL, "meta", params.pop("meta", False))
+        count_only = self._validate(_BOOL, "countOnly", params.pop("countOnly", False))
+        offset, limit = self.validate_pagination(
+            self._validate(_INT, "offset", params.pop("offset", 0)),
+            self._validate(_INT, "limit", params.pop("limit", default_limit)),
+            max_limit,
+            MAX_OFFSET,
+        )
+
+        kwargs = self._arguments(list_method, params, query.resource)
+        if "with_total" in inspect.signature(list_method).parameters:
+            kwargs["with_total"] = meta
+        page = list_method(offset=offset, limit=limit, count_only=count_only, **kwargs)
+        return list_envelope(page, offset, limit, meta=meta, count_only=count_only)
+
+    def select(self, resource: str, params: Dict[str, Any]) -> Page:
+        """
+        Run a resource's list query over all matching records, without pagination.
+
+        Filters, sort and cursor are interpreted exactly as by the list endpoint;
+        the records are the shared ones, not copies.
+
+        Args:
+            resource: Resource name (one of resources)
+            params: Query parameters (camelCase, as in the query string)
+
+        Returns:
+            Page holding every matching record
+
+        Raises:
+            HTTPException: If the resource or a parameter is unknown, a value is
+                invalid, or nothing matches
+        """
+        if resource not in self.resources:
+            raise HTTPException(status_code=404, detail=f"Unknown resource '{resource}'")
+
+        list_method = self.resources[resource][0]
+        kwargs = self._arguments(list_method, params, resource)
+        return list_method(offset=0, limit=len(self.data_loader.records(resource)), **kwargs)
+
+    def _arguments(self, method: Callable, params: Dict[str, Any], resource: str) -> Dict[str, Any]:
+        """
+        Translate query parameters to service method arguments.
+
+        Raises:
+            HTTPException: If a parameter is unknown or has an invalid value
+        """
+        accepted = _parameters(method)
+        kwargs = {}
+        for key, value in params.items():
+            if key not in accepted:
+                raise HTTPException(status_code=400, detail=f"Unknown parameter '{key}' for {resource}")
+            name, validator = accepted[key]
+            kwargs[name] = self._validate(validator, key, value)
+        return kwargs
+
+    @staticmethod
+    def _validate(validator: TypeAdapter, key: str, value: Any) -> Any:
+        """
+        Validate a parameter value the way query string values are validated.
+
+        Raises:
+            HTTPException: If the value is invalid
+        """
+        try:
+            return validator.validate_python(value)
+        except ValidationError:
+            raise HTTPException(status_code=400, detail=f"Invalid value for parameter '{key}'")
+
+
+query_service = QueryService()
@@ -1,10 +1,8 @@
 import logging
-from typing import Any, Dict, List, Optional
-
-from fastapi import HTTPException
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import DEFAULT_MAX_POPULATION, DEFAULT_MIN_POPULATION
-from app.services.base_service import BaseService
+from app.services.base_service import BaseService, Page
 
 logger = logging.getLogger(__name__)
 
@@ -28,59 +26,90 @@ class TownService(BaseService):
         limit: int = 10000,
         fields: Optional[str] = None,
         sort: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        # Get towns (no .copy() needed - filtering creates new list)
-        towns = self.data_loader.towns
-
-        if name:
-            name_alt = name.capitalize()
-            towns = [t for t in towns if name in t["name"] or name_alt in t["name"]]
-
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        ranges = {}
         if min_population is not None or max_population is not None:
             min_pop = min_population if min_population is not None else DEFAULT_MIN_POPULATION
             max_pop = max_population if max_population is not None else DEFAULT_MAX_POPULATION
-            towns = [t for t in towns if min_pop <= t["population"] <= max_pop]
+            ranges["population"] = (min_pop, max_pop)
 
-        if province_id is not None:
-            towns = [t for t in towns if t["provinceId"] == province_id]
+        # Indexed filters are combined as row bitmaps before any record is touched
+        rows = self._select_rows("towns", ranges=ranges, equals={"provinceId": province_id, "districtId": district_id})
 
+        filters = []
+        if name:
+            filters.append(self._text_filter("name", name))
         if province:
-            province_alt = province.capitalize()
-            towns = [t for t in towns if province in t["province"] or province_alt in t["province"]]
+            filters.append(self._text_filter("province", province))
+        if district:
+            filters.append(self._text_filter("district", district))
+
+        if count_only:
+            return Page(total=self._count_rows("towns", rows, filters))
+
+        return self._query_records(
+            "towns",
+            rows,
+            filters,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            not_found="Towns not found.",
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+        )
 
-        if district_id is not None:
-            towns = [t for t in towns if t["districtId"] == district_id]
+    def get_exact_town(self, town_id: int, fields: Optional[str] = None) -> Dict[str, Any]:
+        town = self._get_record("towns", town_id, "Town not found.")
 
-        if district:
-            district_alt = district.capitalize()
-            towns = [t for t in towns if district in t["district"] or district_alt in t["district"]]
+        if fields:
+            town = self._filter_fields(town, fields)
 
-        if not towns:
-            raise HTTPException(status_code=404, detail="Towns not found.")
+        return town
 
-        towns = self._sort_data(towns, sort)
+    def get_towns_by_ids(self, ids: List[int], fields: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get many towns by id in one call.
 
-        len(towns)
-        towns = towns[offset : offset + limit]
+        Args:
+            ids: Town IDs, in the order the results should be returned
+            fields: Comma-separated list of fields to return
 
-        if fields:
-            towns = [self._filter_fields(t, fields) for t in towns]
+        Returns:
+            Tuple of (towns in input order, ids that do not exist)
+        """
+        return self._get_records_by_ids("towns", ids, fields=fields)
 
-        return towns
+    def get_town_ancestry(self, town_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the breadcrumb chain of a town.
 
-    def get_exact_town(self, town_id: int, fields: Optional[str] = None) -> Dict[str, Any]:
-        towns = self.data_loader.towns
-        town = next((t for t in towns if t["id"] == town_id), None)
+        Args:
+            town_id: Town ID
 
-        if not town:
-            raise HTTPException(status_code=404, detail="Town not found.")
+        Returns:
+            {level, id, name} summaries from the province down to the town
 
-        town = town.copy()
+        Raises:
+            HTTPException: If the town does not exist
+        """
+        return self._get_ancestry("towns", town_id, "Town not found.")
 
-        if fields:
-            town = self._filter_fields(town, fields)
+    def get_towns_ancestries(self, ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get the breadcrumb chains of many towns in one call.
 
-        return town
+        Args:
+            ids: Town IDs, in the order the results should be returned
+
+        Returns:
+            Tuple of ({id, ancestry} items in input order, ids that do not exist)
+        """
+        return self._get_ancestries("towns", ids)
 
 
 town_service = TownService()
@@ -1,10 +1,8 @@
 import logging
-from typing import Any, Dict, List, Optional
-
-from fastapi import HTTPException
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import DEFAULT_MAX_POPULATION, DEFAULT_MIN_POPULATION
-from app.services.base_service import BaseService
+from app.services.base_service import BaseService, Page
 
 logger = logging.getLogger(__name__)
 
@@ -28,59 +26,94 @@ class VillageService(BaseService):
         limit: int = 10000,
         fields: Optional[str] = None,
         sort: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        # Get villages (no .copy() needed - filtering creates new list)
-        villages = self.data_loader.villages
-
-        if name:
-            name_alt = name.capitalize()
-            villages = [v for v in villages if name in v["name"] or name_alt in v["name"]]
-
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        count_only: bool = False,
+    ) -> Page:
+        ranges = {}
         if min_population is not None or max_population is not None:
             min_pop = min_population if min_population is not None else DEFAULT_MIN_POPULATION
             max_pop = max_population if max_population is not None else DEFAULT_MAX_POPULATION
-            villages = [v for v in villages if min_pop <= v["population"] <= max_pop]
+            ranges["population"] = (min_pop, max_pop)
 
-        if province_id is not None:
-            villages = [v for v in villages if v["provinceId"] == province_id]
+        # Indexed filters are combined as row bitmaps before any record is touched
+        rows = self._select_rows(
+            "villages", ranges=ranges, equals={"provinceId": province_id, "districtId": district_id}
+        )
 
+        filters = []
+        if name:
+            filters.append(self._text_filter("name", name))
         if province:
-            province_alt = province.capitalize()
-            villages = [v for v in villages if province in v["province"] or province_alt in v["province"]]
+            filters.append(self._text_filter("province", province))
+        if district:
+            filters.append(self._text_filter("district", district))
+
+        if count_only:
+            return Page(total=self._count_rows("villages", rows, filters))
+
+        return self._query_records(
+            "villages",
+            rows,
+            filters,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+            not_found="Villages not found.",
+            cursor=cursor,
+            fields=fields,
+            with_total=with_total,
+        )
 
-        if district_id is not None:
-            villages = [v for v in villages if v["districtId"] == district_id]
+    def get_exact_village(self, village_id: int, fields: Optional[str] = None) -> Dict[str, Any]:
+        village = self._get_record("villages", village_id, "Village not found.")
 
-        if district:
-            district_alt = district.capitalize()
-            villages = [v for v in villages if district in v["district"] or district_alt in v["district"]]
+        if fields:
+            village = self._filter_fields(village, fields)
 
-        if not villages:
-            raise HTTPException(status_code=404, detail="Villages not found.")
+        return village
 
-        villages = self._sort_data(villages, sort)
+    def get_villages_by_ids(
+        self, ids: List[int], fields: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get many villages by id in one call.
 
-        len(villages)
-        villages = villages[offset : offset + limit]
+        Args:
+            ids: Village IDs, in the order the results should be returned
+            fields: Comma-separated list of fields to return
 
-        if fields:
-            villages = [self._filter_fields(v, fields) for v in villages]
+        Returns:
+            Tuple of (villages in input order, ids that do not exist)
+        """
+        return self._get_records_by_ids("villages", ids, fields=fields)
 
-        return villages
+    def get_village_ancestry(self, village_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the breadcrumb chain of a village.
 
-    def get_exact_village(self, village_id: int, fields: Optional[str] = None) -> Dict[str, Any]:
-        villages = self.data_loader.villages
-        village = next((v for v in villages if v["id"] == village_id), None)
+        Args:
+            village_id: Village ID
 
-        if not village:
-            raise HTTPException(status_code=404, detail="Village not found.")
+        Returns:
+            {level, id, name} summaries from the province down to the village
 
-        village = village.copy()
+        Raises:
+            HTTPException: If the village does not exist
+        """
+        return self._get_ancestry("villages", village_id, "Village not found.")
 
-        if fields:
-            village = self._filter_fields(village, fields)
+    def get_villages_ancestries(self, ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get the breadcrumb chains of many villages in one call.
 
-        return village
+        Args:
+            ids: Village IDs, in the order the results should be returned
+
+        Returns:
+            Tuple of ({id, ancestry} items in input order, ids that do not exist)
+        """
+        return self._get_ancestries("villages", ids)
 
 
 village_service = VillageService()
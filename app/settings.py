@@ -6,8 +6,9 @@ support, validation, and sensible defaults.
 """
 
 import os
-from typing import List
+from typing import Dict, List
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -75,6 +76,17 @@ class Settings(BaseSettings):
     # ============================================================================
     data_dir: str = "app/data"
 
+    # ============================================================================
+    # Pre-compressed Response Settings
+    # ============================================================================
+    # Full-dataset responses are compressed once per worker at startup, in a background thread.
+    # These levels take about 1.3 s of CPU; the maximum ones (br 11, zstd 19) shave another
+    # 10-20% off the bodies but take about 18 s.
+    precompressed_enabled: bool = True
+    precompressed_br_level: int = Field(9, ge=0, le=11)
+    precompressed_zstd_level: int = Field(12, ge=1, le=22)
+    precompressed_gzip_level: int = Field(9, ge=1, le=9)
+
     # ============================================================================
     # Security Settings
     # ============================================================================
@@ -118,6 +130,15 @@ class Settings(BaseSettings):
             return "DEBUG"
         return self.log_level.upper()
 
+    @property
+    def precompressed_levels(self) -> Dict[str, int]:
+        """Get the compression level of each pre-compressed content coding."""
+        return {
+            "br": self.precompressed_br_level,
+            "zstd": self.precompressed_zstd_level,
+            "gzip": self.precompressed_gzip_level,
+        }
+
     def get_allowed_origins_list(self) -> List[str]:
         """
         Get list of allowed origins from environment variable or default.
@@ -0,0 +1,47 @@
+"""
+Integration tests for the ancestry endpoints.
+
+Tests breadcrumb chains of single records and batches, built from the
+precomputed child-to-parent pointers.
+"""
+
+
+class TestAncestryEndpoints:
+    """Test suite for /{entity}/{id}/ancestry and /{entity}/ancestry endpoints."""
+
+    def test_neighborhood_ancestry_goes_from_province_to_record(self, client, data_loader):
+        """Should return province, district and neighborhood summaries in that order."""
+        neighborhood = data_loader.neighborhoods[0]
+        response = client.get(f"/api/v1/neighborhoods/{neighborhood['id']}/ancestry")
+        assert response.status_code == 200
+
+        chain = response.json()["data"]
+        assert [level["level"] for level in chain] == ["province", "district", "neighborhood"]
+        assert chain[0] == {"level": "province", "id": neighborhood["provinceId"], "name": neighborhood["province"]}
+        assert chain[1] == {"level": "district", "id": neighborhood["districtId"], "name": neighborhood["district"]}
+        assert chain[2] == {"level": "neighborhood", "id": neighborhood["id"], "name": neighborhood["name"]}
+
+    def test_district_ancestry(self, client):
+        """District chains should stop at the province."""
+        response = client.get("/api/v1/districts/1103/ancestry")
+        assert response.status_code == 200
+        assert [level["level"] for level in response.json()["data"]] == ["province", "district"]
+
+    def test_ancestry_returns_404_for_unknown_id(self, client):
+        """Should return 404 when the record does not exist."""
+        response = client.get("/api/v1/villages/999999999/ancestry")
+        assert response.status_code == 404
+
+    def test_batch_ancestry_keeps_input_order_and_reports_missing(self, client, data_loader):
+        """Batch lookups should match single lookups and list unknown ids."""
+        ids = [town["id"] for town in data_loader.towns[:3]][::-1]
+        response = client.post("/api/v1/towns/ancestry", json={"ids": ids + [-1]})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [item["id"] for item in data["data"]] == ids
+        assert data["data"][0]["ancestry"] == client.get(f"/api/v1/towns/{ids[0]}/ancestry").json()["data"]
+        assert data["missing"] == [-1]
+
+        response = client.get(f"/api/v1/towns/ancestry?ids={ids[0]}")
+        assert response.json()["data"] == data["data"][:1]
@@ -0,0 +1,52 @@
+"""
+Integration tests for the batch lookup endpoints.
+
+Tests lookups of many records by id across entity types, including
+input ordering, missing ids and streamed responses.
+"""
+
+from app.config import BATCH_STREAM_THRESHOLD, MAX_BATCH_IDS
+
+
+class TestBatchEndpoints:
+    """Test suite for /{entity}/batch endpoints."""
+
+    def test_get_batch_keeps_input_order_and_reports_missing(self, client):
+        """GET with ids should return records in input order and list unknown ids."""
+        response = client.get("/api/v1/provinces/batch?ids=34,999,6,1&fields=id,name")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["status"] == "OK"
+        assert [p["id"] for p in data["data"]] == [34, 6, 1]
+        assert set(data["data"][0].keys()) == {"id", "name"}
+        assert data["missing"] == [999]
+
+    def test_post_batch_streams_large_results(self, client, data_loader):
+        """Large batches should be streamed and match the records looked up one by one."""
+        ids = [n["id"] for n in data_loader.neighborhoods[: BATCH_STREAM_THRESHOLD + 10]][::-1]
+        response = client.post("/api/v1/neighborhoods/batch", json={"ids": ids + [-1]})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+
+        data = response.json()
+        assert [n["id"] for n in data["data"]] == ids
+        assert data["data"][0] == client.get(f"/api/v1/neighborhoods/{ids[0]}").json()["data"]
+        assert data["missing"] == [-1]
+
+    def test_district_batch_returns_list_records(self, client):
+        """District batches should hold the records of the list endpoint, without nested children."""
+        batch = client.get("/api/v1/districts/batch?ids=1757").json()["data"]
+        listed = client.get("/api/v1/districts?provinceId=1").json()["data"]
+        assert batch == [district for district in listed if district["id"] == 1757]
+        assert "neighborhoods" not in batch[0]
+
+    def test_batch_rejects_invalid_ids(self, client):
+        """Should return 400 when ids are not integers."""
+        response = client.get("/api/v1/villages/batch?ids=1,abc")
+        assert response.status_code == 400
+
+    def test_batch_rejects_too_many_ids(self, client):
+        """Should return 400 when more than MAX_BATCH_IDS ids are requested."""
+        response = client.post("/api/v1/towns/batch", json={"ids": list(range(MAX_BATCH_IDS + 1))})
+        assert response.status_code == 400
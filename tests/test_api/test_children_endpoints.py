@@ -0,0 +1,54 @@
+"""
+Integration tests for the children sub-resource endpoints.
+
+Tests that child lists served from the hierarchy indexes match the
+filtered list endpoints, and their handling of unknown and childless parents.
+"""
+
+
+class TestChildrenEndpoints:
+    """Test suite for /provinces/{id}/... and /districts/{id}/... endpoints."""
+
+    def test_province_districts_match_filtered_list(self, client):
+        """Should return the same districts as the provinceId filter."""
+        response = client.get("/api/v1/provinces/34/districts?sort=-population&fields=id,name&meta=true")
+        assert response.status_code == 200
+
+        expected = client.get("/api/v1/districts?provinceId=34&sort=-population&fields=id,name").json()
+        data = response.json()
+        assert data["data"] == expected["data"]
+        assert data["meta"]["total"] == len(expected["data"])
+
+    def test_district_neighborhoods_cursor_pages_cover_all_children(self, client, data_loader):
+        """Following nextCursor should visit every neighborhood of the district once."""
+        district_id = data_loader.neighborhoods[0]["districtId"]
+        expected = [n["id"] for n in data_loader.neighborhoods if n["districtId"] == district_id]
+
+        seen, url = [], f"/api/v1/districts/{district_id}/neighborhoods?limit=2"
+        while url:
+            data = client.get(url).json()
+            seen.extend(n["id"] for n in data["data"])
+            cursor = data["nextCursor"]
+            url = f"/api/v1/districts/{district_id}/neighborhoods?limit=2&cursor={cursor}" if cursor else None
+
+        assert seen == expected
+
+    def test_province_neighborhoods_count_only(self, client, data_loader):
+        """countOnly should return the number of neighborhoods in the province."""
+        response = client.get("/api/v1/provinces/6/neighborhoods?countOnly=true")
+        assert response.status_code == 200
+        assert response.json()["data"]["total"] == sum(1 for n in data_loader.neighborhoods if n["provinceId"] == 6)
+
+    def test_district_without_towns_returns_empty_list(self, client, data_loader):
+        """A district without towns should give an empty list, not a 404."""
+        with_towns = {t["districtId"] for t in data_loader.towns}
+        district_id = next(d["id"] for d in data_loader.districts if d["id"] not in with_towns)
+
+        response = client.get(f"/api/v1/districts/{district_id}/towns")
+        assert response.status_code == 200
+        assert response.json()["data"] == []
+
+    def test_children_of_unknown_parent_return_404(self, client):
+        """Should return 404 when the parent does not exist."""
+        assert client.get("/api/v1/districts/999999/villages").status_code == 404
+        assert client.get("/api/v1/provinces/999/districts").status_code == 404
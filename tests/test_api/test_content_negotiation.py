@@ -0,0 +1,59 @@
+"""
+Integration tests for MessagePack and CBOR responses.
+
+Tests that the Accept header selects the response encoding and that every
+encoding carries the same envelope as the default JSON response.
+"""
+
+import pytest
+
+from app.config import LIST_STREAM_THRESHOLD
+from app.services import encoding
+
+msgpack = pytest.importorskip("msgpack")
+cbor2 = pytest.importorskip("cbor2")
+
+DECODERS = {"application/msgpack": msgpack.unpackb, "application/cbor": cbor2.loads}
+
+
+class TestContentNegotiation:
+    """Test suite for Accept header content negotiation."""
+
+    @pytest.mark.parametrize("media_type", DECODERS)
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/v1/provinces?limit=5&meta=true",
+            "/api/v1/provinces/34?extend=true",
+            "/api/v1/districts/1103",
+            "/api/v1/neighborhoods?limit=5&fields=id,name",
+            f"/api/v1/villages?limit={LIST_STREAM_THRESHOLD + 1}",
+            "/api/v1/neighborhoods?countOnly=true",
+        ],
+    )
+    def test_binary_response_matches_json(self, client, url, media_type):
+        """Binary responses should decode to the JSON response body."""
+        response = client.get(url, headers={"Accept": media_type})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == media_type
+        assert "Accept" in response.headers["vary"]
+        assert DECODERS[media_type](response.content) == client.get(url).json()
+
+    def test_json_is_the_default(self, client):
+        """Requests without a supported binary media type should get JSON."""
+        response = client.get("/api/v1/provinces?limit=1", headers={"Accept": "text/html, */*;q=0.1"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+
+    def test_unavailable_encoder_returns_406(self, client, monkeypatch):
+        """Should return 406 when only a binary format without its encoder is acceptable."""
+        monkeypatch.setattr(encoding, "msgpack", None)
+        response = client.get("/api/v1/provinces", headers={"Accept": "application/msgpack"})
+        assert response.status_code == 406
+
+    def test_negotiate_prefers_highest_quality(self):
+        """Media ranges should be tried by decreasing quality."""
+        assert encoding.negotiate("application/json;q=0.5, application/cbor") == "cbor"
+        assert encoding.negotiate("application/x-msgpack, application/json;q=0.9") == "msgpack"
+        assert encoding.negotiate("application/msgpack;q=0, application/json") == "json"
+        assert encoding.negotiate(None) == "json"
@@ -0,0 +1,139 @@
+"""
+Integration tests for the export endpoints.
+
+Tests that the streamed hierarchy and entity exports are complete, follow
+the list endpoints' filters and are well formed in every supported format.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from app.services.base_service import BaseService
+
+
+class TestExportEndpoints:
+    """Test suite for /export endpoints."""
+
+    def test_tree_json_contains_the_whole_hierarchy(self, client, data_loader):
+        """The JSON tree should nest every district and its children under their province."""
+        response = client.get("/api/v1/export/tree")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+
+        provinces = response.json()["data"]
+        assert len(provinces) == len(data_loader.provinces)
+
+        districts = [district for province in provinces for district in province["districts"]]
+        assert len(districts) == len(data_loader.districts)
+        for entity in ("neighborhoods", "villages", "towns"):
+            assert sum(len(district[entity]) for district in districts) == len(getattr(data_loader, entity))
+
+        istanbul = next(province for province in provinces if province["id"] == 34)
+        assert all(district["provinceId"] == 34 for district in istanbul["districts"])
+        assert "postalCode" not in istanbul["districts"][0]
+
+    def test_tree_ndjson_has_one_province_per_line(self, client, data_loader):
+        """Every NDJSON line should hold one complete province."""
+        response = client.get("/api/v1/export/tree?format=ndjson&activatePostalCodes=true")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        lines = response.text.splitlines()
+        assert len(lines) == len(data_loader.provinces)
+
+        province = json.loads(lines[0])
+        assert province["id"] == data_loader.provinces[0]["id"]
+        assert "postalCode" in province["districts"][0]
+
+    def test_tree_rejects_unknown_format(self, client):
+        """Should return 400 for an unsupported format."""
+        response = client.get("/api/v1/export/tree?format=xml")
+        assert response.status_code == 400
+
+    def test_entity_ndjson_matches_list_endpoint(self, client, data_loader):
+        """NDJSON exports should hold the same records, in the same order, as the list endpoint."""
+        district_id = data_loader.villages[0]["districtId"]
+        query = f"districtId={district_id}&sort=-population&fields=id,name,population"
+
+        response = client.get(f"/api/v1/export/villages.ndjson?{query}")
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == 'attachment; filename="villages.ndjson"'
+
+        expected = client.get(f"/api/v1/villages?{query}&limit=50000").json()["data"]
+        assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+    def test_entity_csv_writes_header_and_nested_values_as_json(self, client, data_loader):
+        """CSV exports should have one row per record and JSON-encoded nested fields."""
+        response = client.get("/api/v1/export/provinces.csv?fields=id,name,coordinates")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["id", "name", "coordinates"]
+        assert len(rows) == len(data_loader.provinces) + 1
+        assert json.loads(rows[1][2]) == data_loader.provinces[0]["coordinates"]
+
+    def test_entity_parquet_is_columnar(self, client, data_loader):
+        """Parquet exports should load as a table with the selected columns."""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        response = client.get("/api/v1/export/towns.parquet?fields=id,name,districtId")
+        assert response.status_code == 200
+
+        table = pq.read_table(io.BytesIO(response.content))
+        assert set(table.column_names) == {"id", "name", "districtId"}
+        assert table.column("id").to_pylist() == [town["id"] for town in data_loader.towns]
+
+    def test_arrow_stream_matches_list_endpoint(self, client, data_loader):
+        """Arrow IPC streams should hold the filtered, sorted rows of the list endpoint."""
+        ipc = pytest.importorskip("pyarrow.ipc")
+
+        province_id = data_loader.neighborhoods[0]["provinceId"]
+        query = f"provinceId={province_id}&sort=-population&fields=id,name,population"
+        response = client.get(f"/api/v1/arrow/neighborhoods?{query}")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+        table = ipc.open_stream(response.content).read_all()
+        expected = client.get(f"/api/v1/neighborhoods?{query}&limit=1000").json()["data"]
+        assert table.column_names == ["id", "name", "population"]
+        assert table.to_pylist() == expected
+
+    def test_arrow_stream_contains_every_record(self, client, data_loader):
+        """Unfiltered Arrow streams should hold every record with all its fields."""
+        ipc = pytest.importorskip("pyarrow.ipc")
+
+        response = client.get("/api/v1/export/villages.arrow")
+        assert response.status_code == 200
+
+        table = ipc.open_stream(response.content).read_all()
+        assert table.num_rows == len(data_loader.villages)
+        assert (
+            table.slice(0, 1).to_pylist()[0]
+            == client.get(f"/api/v1/villages/{data_loader.villages[0]['id']}").json()["data"]
+        )
+
+    @pytest.mark.parametrize("format", ["parquet", "arrow"])
+    def test_columnar_export_of_empty_page(self, client, data_loader, format):
+        """Columnar exports of a page past the last row should be empty tables with the selected columns."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        ipc = pytest.importorskip("pyarrow.ipc")
+
+        cursor = BaseService()._encode_cursor("id", max(data_loader.provinces, key=lambda province: province["id"]))
+        response = client.get(f"/api/v1/export/provinces.{format}?sort=id&cursor={cursor}&fields=name")
+        assert response.status_code == 200
+
+        body = io.BytesIO(response.content)
+        table = pq.read_table(body) if format == "parquet" else ipc.open_stream(body).read_all()
+        assert table.num_rows == 0
+        assert table.column_names == ["name"]
+
+    def test_entity_export_rejects_unknown_parameters_and_formats(self, client):
+        """Should validate the entity, format and filters before streaming."""
+        assert client.get("/api/v1/export/villages.xml").status_code == 400
+        assert client.get("/api/v1/export/planets.csv").status_code == 404
+        assert client.get("/api/v1/export/villages.csv?bogus=1").status_code == 400
+        assert client.get("/api/v1/arrow/planets").status_code == 404
@@ -0,0 +1,56 @@
+"""
+Integration tests for the columnar list response formats.
+
+Tests that format=columns and format=rows carry the same records, pagination
+fields and field selection as the default object list.
+"""
+
+import pytest
+
+
+def _records_from_columns(data):
+    return [dict(zip(data, values)) for values in zip(*data.values())]
+
+
+def _records_from_rows(data):
+    return [dict(zip(data["columns"], row)) for row in data["rows"]]
+
+
+class TestListFormats:
+    """Test suite for the format query parameter of list endpoints."""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/v1/neighborhoods?limit=50000",
+            "/api/v1/villages?sort=-population&limit=20&meta=true",
+            "/api/v1/provinces?fields=id,name,nuts.nuts1.code&limit=5",
+            "/api/v1/districts/1103/neighborhoods?fields=id,population",
+        ],
+    )
+    def test_columnar_formats_match_objects(self, client, url):
+        """Columns and rows should decode to the records and envelope of the object list."""
+        expected = client.get(url).json()
+        columns = client.get(f"{url}&format=columns").json()
+        rows = client.get(f"{url}&format=rows").json()
+
+        assert _records_from_columns(columns["data"]) == expected["data"]
+        assert _records_from_rows(rows["data"]) == expected["data"]
+        assert rows["data"]["columns"] == list(columns["data"])
+        for response in (columns, rows):
+            assert {key: value for key, value in response.items() if key != "data"} == {
+                key: value for key, value in expected.items() if key != "data"
+            }
+
+    def test_columns_list_each_field_once(self, client):
+        """Field names should appear once, followed by their values."""
+        response = client.get("/api/v1/towns?fields=id,name&limit=3&format=columns")
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert list(data) == ["id", "name"]
+        assert len(data["id"]) == len(data["name"]) == 3
+
+    def test_unknown_format_is_rejected(self, client):
+        """Should return 400 for an unsupported format."""
+        response = client.get("/api/v1/villages?format=table")
+        assert response.status_code == 400
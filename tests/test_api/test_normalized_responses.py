@@ -0,0 +1,58 @@
+"""
+Integration tests for normalized list responses.
+
+Tests that normalize=true replaces the parent name fields of list records
+with a names side table without losing information.
+"""
+
+NAME_FIELDS = {"province": ("provinceId", "provinces"), "district": ("districtId", "districts")}
+
+
+def _denormalize(record, names, keys):
+    restored = {}
+    for key in keys:
+        if key in NAME_FIELDS:
+            id_field, level = NAME_FIELDS[key]
+            restored[key] = names[level][str(record[id_field])]
+        elif key in record:
+            restored[key] = record[key]
+    return restored
+
+
+class TestNormalizedResponses:
+    """Test suite for the normalize query parameter of list endpoints."""
+
+    def test_names_restore_the_records(self, client):
+        """Records joined with the side table should equal the regular records."""
+        url = "/api/v1/villages?sort=-population&limit=50&meta=true"
+        expected = client.get(url).json()
+        response = client.get(f"{url}&normalize=true")
+        assert response.status_code == 200
+
+        normalized = response.json()
+        assert normalized["meta"] == expected["meta"]
+        assert normalized["nextCursor"] == expected["nextCursor"]
+        for record in normalized["data"]:
+            assert "province" not in record and "district" not in record
+        assert [
+            _denormalize(record, normalized["names"], list(original))
+            for record, original in zip(normalized["data"], expected["data"])
+        ] == expected["data"]
+
+    def test_side_table_lists_each_parent_once(self, client):
+        """The side table should hold the parents of the returned rows only."""
+        data = client.get("/api/v1/districts/1103/neighborhoods?normalize=true").json()
+        assert list(data["names"]["districts"]) == ["1103"]
+        assert len(data["names"]["provinces"]) == 1
+
+    def test_selected_name_fields_become_ids(self, client):
+        """Selecting a name field should return its id field instead."""
+        data = client.get("/api/v1/districts?fields=id,name,province&limit=2&normalize=true").json()
+        assert set(data["data"][0]) == {"id", "name", "provinceId"}
+        assert str(data["data"][0]["provinceId"]) in data["names"]["provinces"]
+
+    def test_normalize_applies_to_columnar_formats(self, client):
+        """Columnar layouts should leave out the name columns too."""
+        data = client.get("/api/v1/towns?limit=5&format=columns&normalize=true").json()
+        assert "province" not in data["data"] and "district" not in data["data"]
+        assert set(map(str, data["data"]["districtId"])) == set(data["names"]["districts"])
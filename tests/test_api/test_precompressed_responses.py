@@ -0,0 +1,147 @@
+"""
+Integration tests for pre-compressed full-dataset responses.
+
+Tests that requests matching a pre-built response are answered from it in
+the negotiated content coding, with the same body as the regular response.
+"""
+
+import asyncio
+import gzip
+import logging
+
+import pytest
+from pydantic import ValidationError
+
+from app.main import _log_artifact_build_failure, app
+from app.services import compression
+from app.services.artifact_service import artifact_service
+from app.settings import Settings
+
+brotli = pytest.importorskip("brotli")
+zstandard = pytest.importorskip("zstandard")
+
+REQUESTS = ("/api/v1/provinces", "/api/v1/districts", "/api/v1/districts?limit=1000", "/api/v1/towns")
+DECOMPRESSORS = {
+    "br": brotli.decompress,
+    "zstd": lambda body: zstandard.ZstdDecompressor().decompress(body),
+    "gzip": gzip.decompress,
+}
+
+
+@pytest.fixture
+def artifacts():
+    """Build the pre-compressed responses of a few requests at fast levels, and drop them afterwards."""
+    asyncio.run(artifact_service.build(app, requests=REQUESTS, levels={"br": 1, "zstd": 1, "gzip": 1}))
+    yield artifact_service
+    asyncio.run(artifact_service.build(app, requests=()))
+
+
+def _raw(client, url, headers):
+    # Response with its body as sent, before the client decodes the content coding
+    with client.stream("GET", url, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestPrecompressedResponses:
+    """Test suite for pre-compressed full-dataset responses."""
+
+    @pytest.mark.parametrize("coding", DECOMPRESSORS)
+    def test_coding_decompresses_to_regular_response(self, client, artifacts, coding):
+        """Every coding should carry the body the route renders."""
+        expected = client.get("/api/v1/provinces?limit=81&offset=0", headers={"Accept-Encoding": "identity"}).content
+        response, body = _raw(client, "/api/v1/provinces", {"Accept-Encoding": coding})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == coding
+        assert response.headers["content-length"] == str(len(body))
+        assert response.headers["content-type"] == "application/json"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert DECOMPRESSORS[coding](body) == expected
+
+    def test_prefers_smallest_coding(self, client, artifacts):
+        """Codings accepted with the same quality should be chosen by preference (br first)."""
+        response, _ = _raw(client, "/api/v1/districts", {"Accept-Encoding": "gzip, deflate, br, zstd"})
+        assert response.headers["content-encoding"] == "br"
+
+    def test_etag_and_not_modified(self, client, artifacts):
+        """Should answer a matching If-None-Match with 304 and give every coding its own ETag."""
+        br = client.get("/api/v1/towns", headers={"Accept-Encoding": "br"})
+        gz = client.get("/api/v1/towns", headers={"Accept-Encoding": "gzip"})
+        assert br.headers["etag"] != gz.headers["etag"]
+
+        response = client.get("/api/v1/towns", headers={"Accept-Encoding": "br", "If-None-Match": br.headers["etag"]})
+        assert response.status_code == 304
+        assert response.headers["etag"] == br.headers["etag"]
+        assert response.content == b""
+
+    def test_query_order_and_shared_bodies(self, client, artifacts):
+        """Requests spelling out the default limit should share the bare request's response."""
+        bare = client.get("/api/v1/districts", headers={"Accept-Encoding": "br"})
+        explicit = client.get("/api/v1/districts?limit=1000", headers={"Accept-Encoding": "br"})
+        assert bare.headers["etag"] == explicit.headers["etag"]
+        assert artifacts.get("/api/v1/districts", "limit=1000") is artifacts.get("/api/v1/districts")
+
+    @pytest.mark.parametrize(
+        "url, headers",
+        [
+            ("/api/v1/provinces?limit=5", {"Accept-Encoding": "br"}),
+            ("/api/v1/provinces", {"Accept-Encoding": "br", "Accept": "application/cbor"}),
+        ],
+    )
+    def test_other_requests_are_rendered(self, client, artifacts, url, headers):
+        """Requests without a pre-built response should go through the routes."""
+        response = client.get(url, headers=headers)
+        assert "etag" not in response.headers
+
+    def test_build_bypasses_user_middleware(self, caplog):
+        """Rendering the responses should not go through the request metrics (or any other user middleware)."""
+        with caplog.at_level(logging.INFO, logger="app.middleware.metrics"):
+            asyncio.run(
+                artifact_service.build(app, requests=("/api/v1/towns",), levels={"br": 1, "zstd": 1, "gzip": 1})
+            )
+        try:
+            assert artifact_service.get("/api/v1/towns") is not None
+            assert not [record for record in caplog.records if record.name == "app.middleware.metrics"]
+        finally:
+            asyncio.run(artifact_service.build(app, requests=()))
+
+    def test_build_skips_error_responses(self):
+        """Requests the routes answer with an error status should get no pre-built response."""
+        try:
+            assert asyncio.run(artifact_service.build(app, requests=("/api/v1/provinces/999",))) == 0
+        finally:
+            asyncio.run(artifact_service.build(app, requests=()))
+
+    def test_failed_build_is_logged(self, caplog):
+        """An error ending the background build should be logged, not left in the task."""
+
+        async def fail():
+            raise RuntimeError("render failed")
+
+        async def failed_task():
+            task = asyncio.create_task(fail())
+            await asyncio.wait([task])
+            return task
+
+        task = asyncio.run(failed_task())
+        with caplog.at_level(logging.ERROR, logger="app.main"):
+            _log_artifact_build_failure(task)
+        assert "Failed to build pre-compressed responses" in caplog.text
+        assert "render failed" in caplog.text
+
+    @pytest.mark.parametrize(
+        "setting", ["precompressed_br_level", "precompressed_zstd_level", "precompressed_gzip_level"]
+    )
+    def test_levels_out_of_range_are_rejected(self, setting):
+        """Compression levels beyond a coding's range should fail when the settings load."""
+        with pytest.raises(ValidationError):
+            Settings(**{setting: 23})
+
+    def test_negotiate_coding(self):
+        """Codings should be picked by quality, then preference, with identity last."""
+        codings = compression.CODINGS
+        assert compression.negotiate_coding("gzip, br", codings) == "br"
+        assert compression.negotiate_coding("gzip;q=1.0, br;q=0.5", codings) == "gzip"
+        assert compression.negotiate_coding("br;q=0.5, identity", codings) == "identity"
+        assert compression.negotiate_coding("*", ("gzip",)) == "gzip"
+        assert compression.negotiate_coding(None, codings) == "identity"
+        assert compression.negotiate_coding("br;q=0, identity;q=0", codings) is None
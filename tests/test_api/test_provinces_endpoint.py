@@ -81,6 +81,31 @@ class TestProvincesEndpoint:
         province = data["data"][0]
         assert set(province.keys()) == {"id", "name", "population"}
 
+    def test_get_provinces_with_cursor(self, client):
+        """Should continue from nextCursor until the last page."""
+        first = client.get("/api/v1/provinces?sort=-population&limit=50").json()
+        assert first["nextCursor"]
+
+        second = client.get(f"/api/v1/provinces?sort=-population&limit=50&cursor={first['nextCursor']}").json()
+        assert len(first["data"]) + len(second["data"]) == 81
+        assert second["nextCursor"] is None
+        assert first["data"][-1]["population"] >= second["data"][0]["population"]
+
+    def test_get_provinces_with_meta(self, client):
+        """Should include pagination metadata when meta=true."""
+        response = client.get("/api/v1/provinces?isCoastal=true&offset=5&limit=10&meta=true")
+        assert response.status_code == 200
+
+        meta = response.json()["meta"]
+        coastal = client.get("/api/v1/provinces?isCoastal=true").json()["data"]
+        assert meta == {"total": len(coastal), "offset": 5, "limit": 10, "hasMore": len(coastal) > 15}
+
+    def test_get_provinces_count_only(self, client):
+        """Should return only the number of matching provinces with countOnly=true."""
+        response = client.get("/api/v1/provinces?countOnly=true")
+        assert response.status_code == 200
+        assert response.json() == {"status": "OK", "data": {"total": 81}}
+
     def test_get_provinces_returns_404_for_invalid_range(self, client):
         """Should return 404 for invalid population range."""
         response = client.get("/api/v1/provinces?minPopulation=2000000&maxPopulation=500000")
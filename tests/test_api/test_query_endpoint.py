@@ -0,0 +1,58 @@
+"""
+Integration tests for the compound query endpoint.
+
+Tests running several named sub-queries in one request, including
+per-query errors and parameter validation.
+"""
+
+
+class TestQueryEndpoint:
+    """Test suite for POST /api/v1/query."""
+
+    def test_query_returns_results_keyed_by_name(self, client):
+        """Each sub-query should return the same data as its own endpoint."""
+        response = client.post(
+            "/api/v1/query",
+            json={
+                "queries": {
+                    "province": {"resource": "provinces", "id": 34, "params": {"fields": "id,name"}},
+                    "districts": {"resource": "districts", "params": {"provinceId": 34, "sort": "name", "meta": True}},
+                    "towns": {"resource": "towns", "params": {"countOnly": True}},
+                }
+            },
+        )
+        assert response.status_code == 200
+
+        data = response.json()["data"]
+        assert data["province"] == {"status": "OK", "data": {"id": 34, "name": "İstanbul"}}
+
+        districts = client.get("/api/v1/districts?provinceId=34&sort=name&limit=100&meta=true").json()
+        assert data["districts"] == districts
+        assert data["towns"] == client.get("/api/v1/towns?countOnly=true").json()
+
+    def test_query_reports_errors_per_sub_query(self, client):
+        """A failing sub-query should not fail the others."""
+        response = client.post(
+            "/api/v1/query",
+            json={
+                "queries": {
+                    "missing": {"resource": "villages", "id": -1},
+                    "unknown": {"resource": "neighborhoods", "params": {"bogus": 1}},
+                    "invalid": {"resource": "neighborhoods", "params": {"minPopulation": "many"}},
+                    "ok": {"resource": "provinces", "params": {"limit": 1, "fields": "id"}},
+                }
+            },
+        )
+        assert response.status_code == 200
+
+        data = response.json()["data"]
+        assert data["missing"] == {"status": "ERROR", "error": "Village not found."}
+        assert data["unknown"]["status"] == "ERROR"
+        assert "bogus" in data["unknown"]["error"]
+        assert data["invalid"]["status"] == "ERROR"
+        assert data["ok"]["data"] == [{"id": 1}]
+
+    def test_query_rejects_unknown_resource(self, client):
+        """Should return 422 for resources that do not exist."""
+        response = client.post("/api/v1/query", json={"queries": {"x": {"resource": "countries"}}})
+        assert response.status_code == 422
@@ -0,0 +1,108 @@
+"""
+Integration tests for response compression.
+
+Tests that responses are compressed in the negotiated content coding, that
+streamed responses are compressed as they are sent, and that compressed
+bodies of repeated responses are served from the cache.
+"""
+
+import gzip
+
+import pytest
+
+from app.config import LIST_STREAM_THRESHOLD
+from app.middleware import compression as compression_middleware
+from app.middleware.compression import CompressedBodyCache
+
+brotli = pytest.importorskip("brotli")
+zstandard = pytest.importorskip("zstandard")
+
+DECOMPRESSORS = {
+    "br": brotli.decompress,
+    "zstd": lambda body: zstandard.ZstdDecompressor().decompressobj().decompress(body),
+    "gzip": gzip.decompress,
+}
+
+
+def _raw(client, url, headers):
+    # Response with its body as sent, before the client decodes the content coding
+    with client.stream("GET", url, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestResponseCompression:
+    """Test suite for the compression middleware."""
+
+    @pytest.mark.parametrize("coding", DECOMPRESSORS)
+    @pytest.mark.parametrize(
+        "url", ["/api/v1/provinces?limit=20", f"/api/v1/villages?limit={LIST_STREAM_THRESHOLD + 1}"]
+    )
+    def test_coding_decompresses_to_identity_response(self, client, url, coding):
+        """Buffered and streamed responses should decompress to the uncompressed body."""
+        expected = client.get(url, headers={"Accept-Encoding": "identity"}).content
+        response, body = _raw(client, url, {"Accept-Encoding": coding})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == coding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert DECOMPRESSORS[coding](body) == expected
+
+    def test_buffered_response_has_compressed_length(self, client):
+        """Responses of known length should carry the length of the compressed body."""
+        response, body = _raw(client, "/api/v1/provinces?limit=20", {"Accept-Encoding": "gzip, br"})
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["content-length"] == str(len(body))
+
+    def test_small_and_excluded_responses_are_not_compressed(self, client):
+        """Responses below the minimum size and compressed media types should be sent as they are."""
+        response, _ = _raw(client, "/api/v1/provinces?limit=1&fields=id", {"Accept-Encoding": "br"})
+        assert "content-encoding" not in response.headers
+
+        pytest.importorskip("pyarrow")
+        response, _ = _raw(client, "/api/v1/export/towns.parquet", {"Accept-Encoding": "br"})
+        assert "content-encoding" not in response.headers
+
+    def test_repeated_response_is_served_from_cache(self, client, monkeypatch):
+        """A repeated response should not be compressed again."""
+        calls = []
+        compress = compression_middleware.compress
+        monkeypatch.setattr(compression_middleware, "compress", lambda *args: calls.append(args) or compress(*args))
+
+        first = client.get("/api/v1/districts?limit=30&sort=-population", headers={"Accept-Encoding": "zstd"})
+        second = client.get("/api/v1/districts?limit=30&sort=-population", headers={"Accept-Encoding": "zstd"})
+        assert second.content == first.content
+        assert len(calls) == 1
+
+    def test_repeated_streamed_response_is_served_from_cache(self, client, monkeypatch):
+        """A repeated streamed response should be answered from the cache, with its length."""
+        streams = []
+        compressor = compression_middleware.StreamCompressor
+        monkeypatch.setattr(
+            compression_middleware, "StreamCompressor", lambda *args: streams.append(args) or compressor(*args)
+        )
+
+        url = f"/api/v1/villages?limit={LIST_STREAM_THRESHOLD + 1}&sort=-population"
+        first, first_body = _raw(client, url, {"Accept-Encoding": "br"})
+        second, second_body = _raw(client, url, {"Accept-Encoding": "br"})
+        assert "content-length" not in first.headers
+        assert second.headers["content-length"] == str(len(second_body))
+        assert second_body == first_body
+        assert len(streams) == 1
+
+        # Another format of the same query is a different response
+        _raw(client, url, {"Accept-Encoding": "br", "Accept": "application/msgpack"})
+        assert len(streams) == 2
+
+    def test_cache_drops_least_recently_used(self):
+        """The cache should stay within its size, dropping the least recently used bodies."""
+        cache = CompressedBodyCache(max_bytes=10)
+        cache.put(("a", "br", 5), b"1234")
+        cache.put(("b", "br", 5), b"1234")
+        assert cache.get(("a", "br", 5)) == b"1234"
+
+        cache.put(("c", "br", 5), b"1234")
+        assert cache.get(("b", "br", 5)) is None
+        assert cache.get(("a", "br", 5)) == b"1234"
+        assert cache.size == 8
+
+        cache.put(("d", "br", 5), b"12345678901")
+        assert cache.get(("d", "br", 5)) is None
@@ -0,0 +1,43 @@
+"""
+Integration tests for streamed list responses.
+
+Tests that large list pages are streamed in chunks and that their body is
+the same envelope a regular response would carry.
+"""
+
+from app.config import LIST_STREAM_THRESHOLD
+
+# Uncompressed, so the client keeps the Content-Length header of regular responses
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+class TestStreamingResponses:
+    """Test suite for list responses above LIST_STREAM_THRESHOLD rows."""
+
+    def test_large_list_is_streamed(self, client, data_loader):
+        """Pages above the threshold should be streamed without a Content-Length."""
+        response = client.get(f"/api/v1/neighborhoods?limit={LIST_STREAM_THRESHOLD + 1}&meta=true", headers=IDENTITY)
+        assert response.status_code == 200
+        assert "content-length" not in response.headers
+
+        data = response.json()
+        assert [n["id"] for n in data["data"]] == [
+            n["id"] for n in data_loader.neighborhoods[: LIST_STREAM_THRESHOLD + 1]
+        ]
+        assert data["meta"]["total"] == len(data_loader.neighborhoods)
+        assert data["nextCursor"] is not None
+
+    def test_streamed_page_matches_regular_pages(self, client):
+        """A streamed projected page should hold the same records as the regular pages covering it."""
+        fields = "id,name,population"
+        streamed = client.get(f"/api/v1/villages?limit={LIST_STREAM_THRESHOLD + 1}&fields={fields}").json()
+        first = client.get(f"/api/v1/villages?limit={LIST_STREAM_THRESHOLD}&fields={fields}").json()
+        last = client.get(f"/api/v1/villages?offset={LIST_STREAM_THRESHOLD}&limit=1&fields={fields}").json()
+
+        assert streamed["data"] == first["data"] + last["data"]
+
+    def test_small_list_is_not_streamed(self, client):
+        """Pages up to the threshold should be sent in one piece."""
+        response = client.get(f"/api/v1/villages?limit={LIST_STREAM_THRESHOLD}", headers=IDENTITY)
+        assert response.status_code == 200
+        assert "content-length" in response.headers
@@ -5,7 +5,12 @@ Tests the singleton pattern, data loading, caching,
 and pre-indexed lookup functionality.
 """
 
+import json
+
+import pytest
+
 from app.services.data_loader import DataLoader, data_loader
+from app.services.indexes import bitmap_positions
 
 
 class TestDataLoader:
@@ -106,6 +111,95 @@ class TestDataLoader:
         index2 = data_loader.districts_by_province
         assert index1 is index2
 
+    def test_range_index_lookup_matches_scan(self, data_loader):
+        """Range index lookups should match a linear scan in dataset order."""
+        index = data_loader.range_index("neighborhoods", "population")
+        expected = [i for i, n in enumerate(data_loader.neighborhoods) if 50000 <= n["population"] <= 10**9]
+        assert index.lookup(50000, 10**9) == expected
+        assert index.count(50000, 10**9) == len(expected)
+
+    def test_range_index_bitmap_matches_lookup(self, data_loader):
+        """Narrow and wide range bitmaps should select the same rows as lookups."""
+        index = data_loader.range_index("villages", "population")
+        for bounds in [(1000, 2000), (1, 10**9)]:
+            assert bitmap_positions(index.bitmap(*bounds)) == index.lookup(*bounds)
+
+    def test_bitmap_index_matches_scan(self, data_loader):
+        """Bitmap index entries should hold the rows with each value."""
+        index = data_loader.bitmap_index("provinces", "isCoastal")
+        expected = [i for i, p in enumerate(data_loader.provinces) if p["isCoastal"]]
+        assert bitmap_positions(index.get(True)) == expected
+        assert index.get("missing") == 0
+
+    def test_range_index_caching(self, data_loader):
+        """Should cache range indexes (same object reference)."""
+        index1 = data_loader.range_index("provinces", "altitude")
+        index2 = data_loader.range_index("provinces", "altitude")
+        assert index1 is index2
+
+    def test_views_keep_row_positions(self, data_loader):
+        """Views should be cached, keep row positions and only differ in postal codes."""
+        view = data_loader.view("districts", postal_codes=False)
+        assert view is data_loader.view("districts", postal_codes=False)
+        assert len(view) == len(data_loader.districts)
+        assert all("postalCode" not in d for d in view)
+        assert [d["id"] for d in view] == [d["id"] for d in data_loader.districts]
+
+    def test_province_view_includes_districts(self, data_loader):
+        """Province views should carry the district summaries without touching the dataset."""
+        province = data_loader.view("provinces")[0]
+        assert province["districts"] == data_loader.districts_by_province[province["id"]]
+        assert "districts" not in data_loader.provinces[0]
+
+    def test_fragments_encode_list_view_records(self, data_loader):
+        """Fragments should decode to the list view record at the same row."""
+        for entity in ("provinces", "districts", "towns"):
+            for postal_codes in (False, True):
+                fragments = data_loader.fragments(entity, postal_codes)
+                view = data_loader.view(entity, postal_codes)
+                assert len(fragments) == len(view)
+                assert json.loads(fragments[-1]) == view[-1]
+
+        # Entities without postal codes share one set of fragments
+        assert data_loader.fragments("towns", False) is data_loader.fragments("towns", True)
+
+    def test_parent_names_cover_the_ancestors_of_the_rows(self, data_loader):
+        """Parent names should map the ancestors of the given rows, top level first."""
+        village = data_loader.villages[0]
+        names = data_loader.parent_names("villages", [0])
+        assert list(names) == ["provinces", "districts"]
+        assert names["provinces"] == {str(village["provinceId"]): village["province"]}
+        assert names["districts"] == {str(village["districtId"]): village["district"]}
+        assert data_loader.parent_names("provinces", [0]) == {}
+
+    def test_shared_data_is_read_only(self, data_loader):
+        """Loaded records and indexes should reject modification."""
+        with pytest.raises(TypeError):
+            data_loader.provinces[0]["name"] = "Changed"
+        with pytest.raises(TypeError):
+            data_loader.districts_by_province[34].append({})
+        with pytest.raises(TypeError):
+            data_loader.view("districts", postal_codes=False)[0]["coordinates"] = None
+
+    def test_shared_indexes_are_read_only(self, data_loader):
+        """Cached indexes, ranks and sort orders should reject modification."""
+        with pytest.raises(TypeError):
+            data_loader.id_index("provinces")[0] = 0
+        with pytest.raises(TypeError):
+            data_loader.value_ranks("districts", "population").append(0)
+        order = data_loader.sort_order("districts", [("population", True)])
+        with pytest.raises(TypeError):
+            order.positions[0] = 0
+        with pytest.raises(TypeError):
+            order.ranks.sort()
+        composite = data_loader.sort_order("districts", [("provinceId", False), ("name", False)])
+        with pytest.raises(TypeError):
+            composite.positions.reverse()
+        with pytest.raises(TypeError):
+            data_loader.range_index("districts", "population").positions.append(0)
+        with pytest.raises(TypeError):
+            data_loader.bitmap_index("districts", "provinceId").bitmaps[34] = 0
+
     def test_province_data_structure(self, data_loader):
         """Provinces should have expected structure."""
         province = data_loader.provinces[0]
@@ -5,6 +5,9 @@ Tests the shared utility methods used across all service classes
 including field filtering, sorting, and pagination validation.
 """
 
+import base64
+import json
+
 import pytest
 from fastapi import HTTPException
 
@@ -49,6 +52,141 @@ class TestBaseService:
         filtered = service._filter_fields(item, "id, name, population")
         assert set(filtered.keys()) == {"id", "name", "population"}
 
+    def test_filter_fields_selects_nested_paths(self, service):
+        """Should select nested fields with dotted paths, also through lists."""
+        item = {
+            "id": 1,
+            "nuts": {"nuts1": {"code": "TR6", "name": "Akdeniz"}, "nuts3": "TR621"},
+            "coordinates": {"latitude": 37.0, "longitude": 35.3},
+            "districts": [{"id": 10, "name": "Seyhan"}, {"id": 11, "name": "Ceyhan"}],
+        }
+        filtered = service._filter_fields(
+            item, "id,nuts.nuts1.code,nuts.nuts3.code,coordinates.latitude,districts.name"
+        )
+        assert filtered == {
+            "id": 1,
+            "nuts": {"nuts1": {"code": "TR6"}},
+            "coordinates": {"latitude": 37.0},
+            "districts": [{"name": "Seyhan"}, {"name": "Ceyhan"}],
+        }
+
+    def test_filter_fields_whole_field_wins_over_path(self, service):
+        """Selecting a field whole should take precedence over selecting part of it."""
+        item = {"id": 1, "coordinates": {"latitude": 37.0, "longitude": 35.3}}
+        assert service._filter_fields(item, "id,coordinates.latitude,coordinates") == item
+        assert service._filter_fields(item, "id,coordinates,coordinates.latitude") == item
+
+    @pytest.mark.parametrize("fields", [".", ",", " , ", "nuts..code", "coordinates. "])
+    def test_filter_fields_rejects_empty_paths(self, service, fields):
+        """Should reject field paths with an empty part, and lists naming no field."""
+        with pytest.raises(HTTPException) as exc_info:
+            service._filter_fields({"id": 1}, fields)
+        assert exc_info.value.status_code == 400
+        assert "invalid field" in exc_info.value.detail.lower()
+
+    def test_filter_fields_skips_blank_entries(self, service):
+        """A trailing comma should not select anything more."""
+        assert service._filter_fields({"id": 1, "name": "Test"}, "id,") == {"id": 1}
+
+    # Indexed Filtering Tests
+    def test_select_rows_matches_scan(self, service):
+        """Combined range and equality bitmaps should select the same rows as a scan."""
+        rows = service._select_rows(
+            "neighborhoods", ranges={"population": (5000, 10**9)}, equals={"provinceId": 34, "districtId": None}
+        )
+        records = service._records_for_rows("neighborhoods", rows)
+        expected = [n for n in service.data_loader.neighborhoods if n["population"] >= 5000 and n["provinceId"] == 34]
+        assert records == expected
+
+    def test_select_rows_returns_none_without_indexed_filters(self, service):
+        """Should return None (all rows) when no indexed filter is given."""
+        assert service._select_rows("towns", ranges={}, equals={"provinceId": None}) is None
+
+    def test_query_records_pages_from_bitmap(self, service):
+        """Unsorted pages read from the bitmap should equal slicing the filtered list."""
+        rows = service._select_rows("villages", equals={"provinceId": 58})
+        page = service._query_records("villages", rows, [], None, 10, 5, "Villages not found.")
+        assert page == [v for v in service.data_loader.villages if v["provinceId"] == 58][10:15]
+
+    def test_query_records_raises_404_when_empty(self, service):
+        """Should raise HTTPException when no row matches."""
+        with pytest.raises(HTTPException) as exc_info:
+            service._query_records("towns", 0, [], None, 0, 10, "Towns not found.")
+        assert exc_info.value.status_code == 404
+
+    # Count Tests
+    def test_count_rows_matches_filtered_length(self, service):
+        """Counts from bitmaps and per-record filters should match the filtered list."""
+        rows = service._select_rows("neighborhoods", ranges={"population": (1000, 5000)})
+        filters = [service._text_filter("name", "Yeni")]
+        expected = [
+            n for n in service.data_loader.neighborhoods if 1000 <= n["population"] <= 5000 and "Yeni" in n["name"]
+        ]
+        assert service._count_rows("neighborhoods", rows, filters) == len(expected)
+        assert service._count_rows("neighborhoods", rows, []) == service.data_loader.range_index(
+            "neighborhoods", "population"
+        ).count(1000, 5000)
+
+    def test_query_records_reports_total(self, service):
+        """Offset pages should carry the total number of matches."""
+        rows = service._select_rows("towns", equals={"provinceId": 58})
+        page = service._query_records("towns", rows, [], "name", 0, 2, "Not found.")
+        assert page.total == len([t for t in service.data_loader.towns if t["provinceId"] == 58])
+
+    # Cursor Pagination Tests
+    @pytest.mark.parametrize("sort", [None, "-population", "name", "districtId,-population,name"])
+    @pytest.mark.parametrize("rows_filter", [None, {"provinceId": 34}])
+    def test_cursor_pages_match_offset_pages(self, service, sort, rows_filter):
+        """Following nextCursor should visit the same rows as offset pagination."""
+        rows = service._select_rows("neighborhoods", equals=rows_filter)
+        expected = service._query_records("neighborhoods", rows, [], sort, 0, 50000, "Not found.")
+
+        crawled, cursor = [], None
+        for _ in range(3):
+            page = service._query_records("neighborhoods", rows, [], sort, 0, 200, "Not found.", cursor=cursor)
+            crawled.extend(page)
+            cursor = page.next_cursor
+        assert crawled == expected[:600]
+
+    def test_cursor_with_text_filter(self, service):
+        """Per-record filters should be applied while seeking."""
+        filters = [service._text_filter("name", "Cumhuriyet")]
+        first = service._query_records("neighborhoods", None, filters, None, 0, 10, "Not found.")
+        second = service._query_records("neighborhoods", None, filters, None, 0, 10, "Not found.", first.next_cursor)
+        expected = [n for n in service.data_loader.neighborhoods if "Cumhuriyet" in n["name"]]
+        assert list(first) + list(second) == expected[:20]
+
+    def test_last_page_has_no_cursor(self, service):
+        """Should not return a cursor when no rows are left."""
+        page = service._query_records("towns", None, [], None, 0, 10000, "Not found.")
+        assert page.next_cursor is None
+
+    def test_cursor_rejects_other_sort_and_garbage(self, service):
+        """Should reject cursors issued for another sort order or that are malformed."""
+        page = service._query_records("towns", None, [], "population", 0, 5, "Not found.")
+        for sort, cursor in [("-population", page.next_cursor), ("population", "not-a-cursor")]:
+            with pytest.raises(HTTPException) as exc_info:
+                service._query_records("towns", None, [], sort, 0, 5, "Not found.", cursor=cursor)
+            assert exc_info.value.status_code == 400
+
+    @pytest.mark.parametrize(
+        "sort, payload",
+        [
+            (None, {"s": "", "k": None, "i": [1]}),
+            (None, {"s": "", "k": None, "i": True}),
+            (None, {"s": "", "k": [1], "i": 1}),
+            ("population", {"s": "population", "k": None, "i": 1}),
+            ("population", {"s": "population", "k": [1, 2], "i": 1}),
+            (None, ["", None, 1]),
+        ],
+    )
+    def test_cursor_rejects_wrong_types(self, service, sort, payload):
+        """Should reject cursors that decode to valid JSON of the wrong shape."""
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=").decode()
+        with pytest.raises(HTTPException) as exc_info:
+            service._query_records("towns", None, [], sort, 0, 5, "Not found.", cursor=cursor)
+        assert exc_info.value.status_code == 400
+
     # Sorting Tests
     def test_sort_data_ascending(self, service, sample_data):
         """Should sort data in ascending order."""
@@ -80,6 +218,41 @@ class TestBaseService:
         assert exc_info.value.status_code == 400
         assert "invalid sort field" in exc_info.value.detail.lower()
 
+    def test_sort_data_uses_turkish_alphabet_for_names(self, service):
+        """Names should follow the Turkish alphabet, including dotted and dotless i."""
+        names = ["Zonguldak", "Şanlıurfa", "İzmir", "Iğdır", "Çankırı", "Sivas", "Isparta", "Bursa", "Hatay"]
+        sorted_data = service._sort_data([{"name": name} for name in names], "name")
+        assert [d["name"] for d in sorted_data] == [
+            "Bursa",
+            "Çankırı",
+            "Hatay",
+            "Iğdır",
+            "Isparta",
+            "İzmir",
+            "Sivas",
+            "Şanlıurfa",
+            "Zonguldak",
+        ]
+
+    def test_sort_data_by_multiple_fields(self, service):
+        """Should sort by each field in turn, with its own direction."""
+        data = [
+            {"id": 1, "provinceId": 2, "population": 10},
+            {"id": 2, "provinceId": 1, "population": 5},
+            {"id": 3, "provinceId": 2, "population": 30},
+            {"id": 4, "provinceId": 1, "population": 50},
+        ]
+        sorted_data = service._sort_data(data, "provinceId,-population")
+        assert [d["id"] for d in sorted_data] == [4, 2, 3, 1]
+
+    @pytest.mark.parametrize("sort", ["provinceId,-population,name", "-districtId,name", "name,-id"])
+    def test_query_records_multi_field_sort_matches_sort_data(self, service, sort):
+        """Composite orders built from value ranks should match sorting the records directly."""
+        records = service.data_loader.neighborhoods
+        expected = service._sort_data(list(records), sort)[:50]
+        page = service._query_records("neighborhoods", None, [], sort, 0, 50, "Not found.")
+        assert page == expected
+
     # Pagination Validation Tests
     def test_validate_pagination_accepts_valid_values(self, service):
         """Should accept valid pagination parameters."""
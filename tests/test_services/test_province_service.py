@@ -5,6 +5,8 @@ Tests the business logic of province data operations including
 filtering, sorting, pagination, and error handling.
 """
 
+import json
+
 import pytest
 from fastapi import HTTPException
 
@@ -94,6 +96,14 @@ class TestProvinceService:
         populations = [p["population"] for p in result]
         assert populations == sorted(populations, reverse=True)
 
+    def test_get_provinces_sorts_names_in_turkish_order(self):
+        """Should sort names by the Turkish alphabet, in both directions."""
+        names = [p["name"] for p in province_service.get_provinces(sort="name")]
+        assert names.index("Bursa") < names.index("Çanakkale") < names.index("Denizli")
+        assert names.index("Hatay") < names.index("Iğdır") < names.index("Isparta") < names.index("İstanbul")
+        assert names.index("Sivas") < names.index("Şanlıurfa") < names.index("Tekirdağ")
+        assert [p["name"] for p in province_service.get_provinces(sort="-name")] == names[::-1]
+
     def test_get_provinces_raises_on_invalid_sort_field(self):
         """Should raise HTTPException for invalid sort field."""
         with pytest.raises(HTTPException) as exc_info:
@@ -114,6 +124,19 @@ class TestProvinceService:
         assert "districts" in result[0]
         assert isinstance(result[0]["districts"], list)
 
+    def test_get_provinces_returns_read_only_records(self):
+        """Returned provinces are the shared records and cannot be modified."""
+        result = province_service.get_provinces(is_coastal=True, limit=1)
+        with pytest.raises(TypeError):
+            result[0]["name"] = "Changed"
+
+    def test_cursor_pages_count_only_when_asked(self):
+        """Cursor pages should carry the total only when it is asked for."""
+        cursor = province_service.get_provinces(sort="-population", limit=10).next_cursor
+        assert province_service.get_provinces(sort="-population", limit=10, cursor=cursor).total is None
+        page = province_service.get_provinces(sort="-population", limit=10, cursor=cursor, with_total=True)
+        assert page.total == 81
+
     def test_get_exact_province_returns_province_by_id(self):
         """Should return specific province by ID."""
         province = province_service.get_exact_province(province_id=1)
@@ -140,6 +163,28 @@ class TestProvinceService:
         assert isinstance(district["neighborhoods"], list)
         assert isinstance(district["villages"], list)
 
+    def test_get_exact_province_extend_does_not_leak(self):
+        """Extended lookups should not add neighborhoods to the shared district summaries."""
+        province_service.get_exact_province(34, extend=True)
+        result = province_service.get_exact_province(34)
+        assert all("neighborhoods" not in d and "villages" not in d for d in result["districts"])
+
+    @pytest.mark.parametrize("extend", [False, True])
+    @pytest.mark.parametrize("activate_postal_codes", [False, True])
+    def test_get_exact_province_document_matches_province(self, extend, activate_postal_codes):
+        """Pre-serialized documents should hold the same data as the composed province."""
+        document = province_service.get_exact_province_document(
+            34, extend=extend, activate_postal_codes=activate_postal_codes
+        )
+        province = province_service.get_exact_province(34, extend=extend, activate_postal_codes=activate_postal_codes)
+        assert json.loads(document) == province
+
+    def test_get_exact_province_document_raises_404(self):
+        """Should raise 404 for unknown provinces."""
+        with pytest.raises(HTTPException) as exc_info:
+            province_service.get_exact_province_document(999)
+        assert exc_info.value.status_code == 404
+
     def test_get_exact_province_filters_fields(self):
         """Should return only specified fields for exact province."""
         province = province_service.get_exact_province(province_id=1, fields="id,name,population")